@@ -0,0 +1,67 @@
+#!/usr/bin/python
+import sys,os
+from skeletons import template
+from support import generationContext
+
+def splitTypes(types):
+    #comma separated C++ types, commas inside template arguments kept
+    ret,depth,start = [],0,0
+    for pos,char in enumerate(types):
+        if char in '<(':
+            depth += 1
+        elif char in '>)':
+            depth -= 1
+        elif char==',' and depth==0:
+            ret.append(types[start:pos].strip())
+            start = pos+1
+    ret.append(types[start:].strip())
+    return [ctype for ctype in ret if not ctype=='']
+
+def valueType(ctype):
+    #the type an operator() argument is made from: no const, no reference
+    ctype = ctype.strip().rstrip('&').strip()
+    return ctype[len('const '):].strip() if ctype.startswith('const ') else ctype
+
+def benchStanza(name):
+    #CMake target of the benchmark driver, paths relative to the package
+    return ('# micro-benchmark of %s, operator() called without the event loop\n'
+            'gaudi_add_executable(%sBench\n'
+            '                     src/%sBench.cpp src/%s.cpp\n'
+            '                     INCLUDE_DIRS src\n'
+            '                     LINK_LIBRARIES GaudiAlgLib GaudiKernel)\n')%(name,name,name,name)
+
+def benchFields(configs):
+    #the synthetic inputs and the call of operator(), from the input types of the class
+    inputs = []
+    if not configs.GaudiFunctional=='Producer':
+        inputs = [valueType(ctype) for ctype in splitTypes(configs.GaudiFunctionalInput)]
+    fields = {}
+    if len(inputs)==0:
+        fields['benchInputs'] = '(void)size; // no input to scale'
+    else:
+        fields['benchInputs'] = '\n    '.join('const auto input%d = synthetic<%s>( size );'%(num+1,ctype)
+                                             for num,ctype in enumerate(inputs))
+    call = 'alg( %s )'%', '.join('input%d'%(num+1) for num in range(len(inputs))) if len(inputs)>0 else 'alg()'
+    if configs.GaudiFunctional=='Consumer':
+        fields['benchCall'] = call+';'
+    else:
+        fields['benchCall'] = 'const auto result = %s;\n            escape( &result );'%call
+    return fields
+
+class LHCbBench:
+    def __init__(self, name,configs = None, requirements = None, context = None):
+        self.name = name
+        self.configs = configs
+        self.configs.name = name
+        self.requirements = requirements
+        #context: per class fields, computed here unless given (see variants.py)
+        if context==None:
+            generation = generationContext()
+            context = {'date':generation.date,'author':generation.author}
+        self.configs.date = context['date']
+        self.configs.author = context['author']
+        fields = benchFields(self.configs)
+        for field in fields:
+            setattr(self.configs,field,context.get(field,fields[field]))
+        temp = template('GFA','cpp','bench')
+        self.genText =  temp.safe_substitute(vars(self.configs))
@@ -1,38 +1,101 @@
 #!/usr/bin/python
-import sys,os,pwd,time
-from string import Template
-from support import comment
+import sys,os
+from skeletons import template
+from support import comment,generationContext,toolIncludes,pchInclude
+from LHCbHeader import functionalReturn
+
+#--timing: scoped timer adding the time of execute()/operator() to m_timing (see LHCbHeader.py)
+timingTimer = """
+
+#include <chrono>
+
+#ifdef NO_ALGORITHM_TIMING
+#define ALGORITHM_TIMER( counter )
+#else
+namespace {
+  /// adds the wall time of its scope, in microseconds, to a counter
+  class ScopedTimer {
+  public:
+    explicit ScopedTimer( Gaudi::Accumulators::StatCounter<>& counter )
+      : m_counter( counter ), m_start( std::chrono::steady_clock::now() ) {}
+    ~ScopedTimer() {
+      m_counter += std::chrono::duration<double, std::micro>( std::chrono::steady_clock::now() - m_start ).count();
+    }
+  private:
+    Gaudi::Accumulators::StatCounter<>&   m_counter;
+    std::chrono::steady_clock::time_point m_start;
+  };
+}
+#define ALGORITHM_TIMER( counter ) ScopedTimer algorithmTimer( counter )
+#endif"""
+
+def soaBody(configs,ret):
+    #operator() filling structure of arrays outputs: reserved once, moved out
+    lines = ['%s ret;'%ret]
+    if configs.GaudiFunctional=='SplittingTransformer':
+        lines = ['%s ret( NOUTPUTS );'%ret,
+                 'for ( auto& output : ret ) output.reserve( NENTRIES ); // columns allocated once']
+    elif ret.startswith('std::tuple<bool,'):
+        lines+= ['std::get<0>( ret ) = true; // filter decision']
+        lines+= ['std::get<%d>( ret ).reserve( NENTRIES );'%(i+1) for i in range(ret.count('OUTPUT'))]
+    elif ret.startswith('std::tuple<'):
+        lines+= ['std::get<%d>( ret ).reserve( NENTRIES );'%i for i in range(ret.count('OUTPUT'))]
+    else:
+        lines+= ['ret.reserve( NENTRIES ); // columns allocated once']
+    lines+= ['// push_back one entry per column for every object','return ret; // moved out, not copied']
+    return '\n  '.join(lines)
+
+def functionalBody(configs):
+    #what a GaudiFunctional .cpp takes from the types of the class
+    ret = functionalReturn(configs)
+    body = ret + ' ret; return ret;'
+    if configs.GaudiFunctional=='Consumer':
+        body = 'return;'
+    elif configs.GaudiFunctional=='FilterPredicate':
+        body = 'return true;'
+    elif configs.soa==True:
+        body = soaBody(configs,ret)
+    return {'GaudiFunctionalInput':configs.GaudiFunctionalInput if not configs.GaudiFunctional=='Producer' else '',
+            'GaudiFunctionalReturn':ret,
+            'operatorParenText':body}
 
 class LHCbCpp:
-    def __init__(self, name,configs = None, requirements = None):
+    def __init__(self, name,configs = None, requirements = None, context = None):
         self.name = name
         self.configs = configs
         self.configs.name = name
         self.requirements = requirements
-        self.configs.date = time.strftime("%Y-%m-%d")
-        self.configs.author = (pwd.getpwuid(os.getuid())[4]).split(',')[0]
-        curr_path = os.path.dirname(os.path.abspath(__file__))
+        #context: per class fields, computed here unless given (see variants.py)
+        if context==None:
+            generation = generationContext()
+            context = {'date':generation.date,'author':generation.author}
+        self.configs.date = context['date']
+        self.configs.author = context['author']
+        self.configs.pchInclude = context.get('pchInclude',pchInclude(self.configs.pch))
+        self.configs.toolIncludes = context.get('toolIncludes',toolIncludes(self.configs.Tool,self.configs.lean))
+        self.configs.timingTimer = timingTimer if self.configs.timing==True else ''
+        self.configs.timingScope = '\n  ALGORITHM_TIMER( m_timing );' if self.configs.timing==True else ''
         if self.configs.type =='GFA':
             if self.configs.GaudiFunctional=='Producer':
-                self.configs.GaudiFunctionalInput = ''
                 self.configs.ref = ''
             else:
                 self.configs.ref = '&'
-            the_string = open(curr_path+'/raw_skeletons/raw_GaudiFunctional.cpp','r').read()
-            self.configs.operatorParenText = self.configs.GaudiFunctionalOutput + ' ret; return ret;'
-            if self.configs.GaudiFunctional=='Consumer':
-                self.configs.operatorParenText = 'return;'
+            temp = template('GFA','cpp',self.configs.GaudiFunctional)
+            #types are per class (see LHCbHeader.functionalFields)
+            fields = functionalBody(self.configs)
+            for field in fields:
+                setattr(self.configs,field,context.get(field,fields[field]))
         elif self.configs.type == 'T':
-            the_string = open(curr_path+'/raw_skeletons/raw_Tool.cpp','r').read()
+            temp = template('T','cpp')
             if not self.configs.Interface==None:
                 self.configs.tool_interface = self.configs.Interface
             else:
                 self.configs.tool_interface = self.configs.name
         elif self.configs.type == 'I':
             pass
-            #the_string = open(curr_path+'/raw_skeletons/raw_Interface.cpp','r').read()
+            #temp = template('I','cpp')
         elif self.configs.type == 'DVA':
-            the_string = open(curr_path+'/raw_skeletons/raw_DaVinciAlgorithm.cpp','r').read()
+            temp = template('DVA','cpp','reentrant' if self.configs.reentrant==True else self.configs.DaVinciAlgorithmType)
             if self.configs.DaVinciAlgorithmType=='Normal':
                 self.configs.DaVinciAlgorithmTypeName=''
             else:
@@ -42,10 +105,9 @@ class LHCbCpp:
                 self.configs.AlgorithmTypeName='Algorithm'
             else:
                 self.configs.AlgorithmTypeName = self.configs.AlgorithmType+'Alg'
-            the_string = open(curr_path+'/raw_skeletons/raw_Algorithm.cpp','r').read()
+            temp = template('A','cpp','reentrant' if self.configs.reentrant==True else self.configs.AlgorithmType)
         else:
-            the_string = open(curr_path+'/raw_skeletons/raw_class.cpp','r').read()
-        temp = Template(the_string)
+            temp = template('S','cpp')
         self.genText =  temp.safe_substitute(vars(self.configs))
 
 
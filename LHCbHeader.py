@@ -1,37 +1,127 @@
 #!/usr/bin/python
-import sys,os
-from string import Template
-from support import * #doxyComment,comment,exists
+import sys,os,re
+from skeletons import template
+from support import doxyComment,comment,toolDeclarations
+def soaStruct(name):
+    #structure of arrays output type: one column per field, all reserved at once
+    return ('/// structure of arrays: one contiguous column per field, sized by reserve()\n'
+            'struct %s {\n'
+            '  std::vector<float> x, y, z; // one column per field\n'
+            '  void        reserve( std::size_t n ) { x.reserve( n ); y.reserve( n ); z.reserve( n ); }\n'
+            '  std::size_t size() const { return x.size(); }\n'
+            '};\n\n')%name
+
+#--timing: counter of the time per event, filled by the timer of LHCbCpp.timingTimer
+timingMember = ('\n#ifndef NO_ALGORITHM_TIMING\n'
+                '  /// time per event, compiled out with -DNO_ALGORITHM_TIMING\n'
+                '  mutable Gaudi::Accumulators::StatCounter<> m_timing{ this, "Time per event [us]" };\n'
+                '#endif')
+
+#default (input, output) locations per GaudiFunctional type
+GFLocations = {'Producer':([],['"OUTPUTLOCATION"']),
+               'Consumer':(['"INPUTLOCATION"'],[]),
+               'Transformer':(['"INPUTLOCATION"'],['"OUTPUTLOCATION"']),
+               'MultiTransformer':(['"INPUT1LOC"','"INPUT2LOC"'],['"OUTPUTLOC1"','"OUTPUTLOC2"']),
+               'SplittingTransformer':(['"INPUTLOCATION"'],['"OUTPUTLOCATION1"','"OUTPUTLOCATION2"']),
+               'MergingTransformer':(['"INPUTLOCATION1"','"INPUTLOCATION2"'],['"OUTPUTLOCATION"']),
+               'FilterPredicate':(['"INPUTLOCATION"'],[]),
+               'MultiTransformerFilter':(['"INPUTLOCATION"'],['"OUTPUTLOC1"','"OUTPUTLOC2"'])}
+
+def cppLocations(locations):
+    #comma separated locations as C++: paths are quoted, constants (A::B) kept as they are
+    ret = []
+    for loc in locations.split(','):
+        loc = loc.strip()
+        ret.append(loc if loc.startswith('"') or '::' in loc else '"%s"'%loc)
+    return ret
+
+def locationProperties(kind,locations,vector=False):
+    #[(property, [locations])] of one side of a GaudiFunctional, as named by its constructor
+    if vector:
+        return [('%sLocations'%kind,locations)]
+    if len(locations)==1:
+        return [('%sLocation'%kind,locations)]
+    return [('%s%d'%(kind,num+1),[loc]) for num,loc in enumerate(locations)]
+
+def keyValues(kind,locations,vector=False):
+    #constructor argument(s) naming the locations: one KeyValue, a list of them, or a KeyValues
+    if vector:
+        return 'KeyValues("%s",{%s})'%(locationProperties(kind,locations,vector)[0][0],','.join(locations))
+    ret = ['KeyValue("%s",{%s})'%(prop,locs[0]) for prop,locs in locationProperties(kind,locations)]
+    return ret[0] if len(ret)==1 else '{'+',\n '.join(ret)+'}'
+
+def functionalLocations(configs):
+    #(inputs, outputs) of a GaudiFunctional as C++: the defaults of its type unless given
+    inputs,outputs = GFLocations.get(configs.GaudiFunctional,([],[]))
+    if not configs.GaudiFunctionalInputLocations==None:
+        inputs = cppLocations(configs.GaudiFunctionalInputLocations)
+    if not configs.GaudiFunctionalOutputLocations==None:
+        outputs = cppLocations(configs.GaudiFunctionalOutputLocations)
+    return inputs,outputs
+
+def funcIO(configs):
+    #constructor arguments naming the locations of a GaudiFunctional
+    inputs,outputs = functionalLocations(configs)
+    ret = []
+    if len(inputs)>0:
+        ret.append(keyValues('Input',inputs,configs.GaudiFunctional=='MergingTransformer'))
+    if len(outputs)>0:
+        ret.append(keyValues('Output',outputs,configs.GaudiFunctional=='SplittingTransformer'))
+    return ',\n'.join(ret)
+
+def functionalReturn(configs):
+    #MultiTransformerFilter returns the filter decision first
+    if configs.GaudiFunctional=='MultiTransformerFilter':
+        return configs.GaudiFunctionalOutput.replace('std::tuple<','std::tuple<bool,',1)
+    return configs.GaudiFunctionalOutput
+
+def functionalFields(configs):
+    #what a GaudiFunctional header takes from the types and locations of the class
+    fields = {'GaudiFunctionalInput':configs.GaudiFunctionalInput if not configs.GaudiFunctional=='Producer' else '',
+              'GaudiFunctionalOutput':configs.GaudiFunctionalOutput,
+              'GaudiFunctionalReturn':functionalReturn(configs),
+              'funcIO':funcIO(configs),
+              'soaStructs':''}
+    if configs.soa==True:
+        fields['soaStructs'] = '#include <vector>\n\n'+''.join(soaStruct(output) for output in re.findall(r'\bOUTPUT\d*\b',configs.GaudiFunctionalOutput))
+    return fields
+
 class LHCbHeader:
-    def __init__(self, name, configs = None, requirements = None):
+    def __init__(self, name, configs = None, requirements = None, context = None):
         self.name = name
         self.configs = configs
         self.configs.name = name
         self.requirements = requirements
-        self.configs.comment = doxyComment(first=True, text = name)
-        the_string = ''
-        curr_path = os.path.dirname(os.path.abspath(__file__))
+        #context: per class fields, computed here unless given (see variants.py)
+        if context==None:
+            context = {'comment':doxyComment(first=True, text = name)}
+        self.configs.comment = context['comment']
+        #the -T interfaces: forward declared in lean headers, the .cpp includes them (see LHCbCpp)
+        self.configs.forwardDecls = context.get('forwardDecls',toolDeclarations(self.configs.Tool,self.configs.lean))
+        self.configs.timingInclude = ''
+        self.configs.timingMember = ''
+        if self.configs.timing==True:
+            self.configs.timingMember = timingMember
+            #the reentrant skeletons use counters already
+            if not (self.configs.reentrant==True and self.configs.type in ['A','DVA']):
+                self.configs.timingInclude = '\n#include "Gaudi/Accumulators.h"'
 
         if self.configs.type =='GFA':
-            the_string = open(curr_path+'/raw_skeletons/raw_GaudiFunctional.h','r').read()
+            temp = template('GFA','h',self.configs.GaudiFunctional)
             self.configs.ref = '&'
-            funcIO = ''
             if self.configs.GFInheritance ==None:
                 self.configs.GFInheritance=''
             if self.configs.GaudiFunctional=='Producer':
                 #no input, only output
-                funcIO = 'KeyValue("OutputLocation",{"OUTPUTLOCATION"})'
-                self.configs.GaudiFunctionalInput = ''
                 self.configs.ref = ''
-            elif self.configs.GaudiFunctional=='Transformer':
-                funcIO = 'KeyValue("InputLocation",{"INPUTLOCATION"}),\nKeyValue("OutputLocation",{"OUTPUTLOCATION"})'
-            elif self.configs.GaudiFunctional=='Consumer':
-                funcIO = 'KeyValue("InputLocation",{"INPUTLOCATION"})'
-
-            elif self.configs.GaudiFunctional=='MultiTransformer':
-                funcIO = '{KeyValue("Input1",{"INPUT1LOC"}),\n KeyValue("Input2",{"INPUT2LOC"})},\n{KeyValue("Output1",{"OUTPUTLOC1"}),\n KeyValue("Output2",{"OUTPUTLOC2"})}'
-
-            self.configs.funcIO = funcIO
+            #types and locations (default unless --inputLocations/--outputLocations) are per class
+            fields = functionalFields(self.configs)
+            for field in fields:
+                setattr(self.configs,field,context.get(field,fields[field]))
+            #MultiTransformerFilter lives in Transformer.h
+            self.configs.GaudiFunctionalHeader = self.configs.GaudiFunctional
+            if self.configs.GaudiFunctional=='MultiTransformerFilter':
+                self.configs.GaudiFunctionalHeader = 'Transformer'
 
         elif self.configs.type == 'T':
             self.configs.ExtraToolString = ''
@@ -42,26 +132,25 @@ class LHCbHeader:
                 self.configs.ExtraToolRet = ''
             else:
                 self.configs.ExtraToolRet = 'static const InterfaceID& interfaceID() { return IID_%s; }'%self.configs.name
-            the_string = open(curr_path+'/raw_skeletons/raw_Tool.h','r').read()
+            temp = template('T','h')
 
         elif self.configs.type == 'I':
-            the_string = open(curr_path+'/raw_skeletons/raw_Interface.h','r').read()
+            temp = template('I','h','lean' if self.configs.lean==True else None)
 
         elif self.configs.type == 'DVA':
             if self.configs.DaVinciAlgorithmType=='Normal':
                 self.configs.DaVinciAlgorithmTypeName=''
             else:
                 self.configs.DaVinciAlgorithmTypeName = self.configs.DaVinciAlgorithmType
-            the_string = open(curr_path+'/raw_skeletons/raw_DaVinciAlgorithm.h','r').read()
+            temp = template('DVA','h','reentrant' if self.configs.reentrant==True else self.configs.DaVinciAlgorithmType)
 
         elif self.configs.type == 'A':
             if self.configs.AlgorithmType == "Normal":
                 self.configs.AlgorithmTypeName='Algorithm'
             else:
                 self.configs.AlgorithmTypeName = self.configs.AlgorithmType+'Alg'
-            the_string = open(curr_path+'/raw_skeletons/raw_Algorithm.h','r').read()
+            temp = template('A','h','reentrant' if self.configs.reentrant==True else self.configs.AlgorithmType)
 
         else:
-            the_string = open(curr_path+'/raw_skeletons/raw_class.h','r').read()
-        temp = Template(the_string)
+            temp = template('S','h')
         self.genText =  temp.safe_substitute(vars(self.configs))
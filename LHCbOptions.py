@@ -0,0 +1,106 @@
+#!/usr/bin/python
+# What:  multithreaded (Hive) job options running generated algorithms
+#
+# The options set up the whiteboard (event slots), the scheduler (thread pool) and the slim event
+# loop manager, and give every algorithm its data locations: the KeyValue properties of a
+# GaudiFunctional, named as in its constructor (see LHCbHeader.funcIO), and the handles of a
+# reentrant A/DVA. The scheduler runs the algorithms in the order these data dependencies give.
+# Threads and slots default to what was asked for when generating and can be changed per run:
+#   THREADS=8 SLOTS=10 EVTMAX=1000 gaudirun.py MyAlgOptions.py
+
+import re
+from LHCbHeader import functionalLocations,locationProperties
+
+#data handles of the reentrant skeletons, (inputs, outputs) as [(property, [locations])]
+handleLocations = {'A':([('InputLocation',['"INPUTLOCATION"'])],[('OutputLocation',['"OUTPUTLOCATION"'])]),
+                   'DVA':([('Inputs',['"INPUTLOCATION"'])],[('Output',['"OUTPUTLOCATION"'])])}
+#names the options file uses itself
+reserved = ['os','threads','slots','whiteboard','scheduler','eventloop']
+
+def dataLocations(options):
+    #(inputs, outputs) of a generated algorithm as [(property, [C++ locations])], or None
+    if options.type=='GFA':
+        inputs,outputs = functionalLocations(options)
+        return (locationProperties('Input',inputs,options.GaudiFunctional=='MergingTransformer') if len(inputs)>0 else [],
+                locationProperties('Output',outputs,options.GaudiFunctional=='SplittingTransformer') if len(outputs)>0 else [])
+    if options.reentrant==True:
+        return handleLocations.get(options.type)
+    return None
+
+def isPath(loc):
+    return re.match(r'^"[^"\\]*"$',loc) is not None
+
+def setLocations(var,props,vector):
+    #python setting each property, constants (A::B) are left to their C++ default
+    ret = []
+    for prop,locs in props:
+        if not all(isPath(loc) for loc in locs):
+            ret.append('# %s.%s keeps its C++ default, %s'%(var,prop,', '.join(locs)))
+        elif vector and prop.endswith('Locations'):
+            ret.append('%s.%s = [%s]'%(var,prop,', '.join(locs)))
+        else:
+            ret.append('%s.%s = %s'%(var,prop,locs[0]))
+    return ret
+
+def ordered(classes):
+    #producers before their consumers, otherwise in the given order
+    produced = dict((loc,name) for name,options in classes if not dataLocations(options)==None
+                    for prop,locs in dataLocations(options)[1] for loc in locs)
+    ret,placed = [],set()
+    todo = list(classes)
+    while len(todo)>0:
+        for num,(name,options) in enumerate(todo):
+            needs = [produced[loc] for prop,locs in (dataLocations(options) or ([],[]))[0] for loc in locs
+                     if loc in produced and not produced[loc]==name]
+            if all(need in placed for need in needs) or num==len(todo)-1:
+                break
+        ret.append(todo.pop(num))
+        placed.add(name)
+    return ret
+
+def hiveOptions(classes,threads=None,slots=None):
+    #options text running classes, [(name, parsed options)] of A, DVA or GFA classes
+    threads = threads if not threads==None else 4
+    slots = slots if not slots==None else threads+1
+    classes = ordered(classes)
+    names = [name for name,options in classes]
+    produced = set(loc for name,options in classes if not dataLocations(options)==None
+                   for prop,locs in dataLocations(options)[1] for loc in locs)
+    text = '# Multithreaded (Hive) options running %s\n'%', '.join(names)
+    text+= '#   THREADS=%d SLOTS=%d EVTMAX=100 gaudirun.py <this file>\n'%(threads,slots)
+    text+= 'import os\n'
+    text+= 'from Gaudi.Configuration import *\n'
+    text+= 'from Configurables import HiveWhiteBoard, HiveSlimEventLoopMgr, AvalancheSchedulerSvc\n'
+    text+= 'from Configurables import %s\n\n'%', '.join(names)
+    text+= 'threads = int(os.environ.get("THREADS", %d))\n'%threads
+    text+= 'slots = int(os.environ.get("SLOTS", %d))\n\n'%slots
+    text+= '# events in flight (one slot each) and the threads running their algorithms\n'
+    text+= 'whiteboard = HiveWhiteBoard("EventDataSvc", EventSlots=slots, ForceLeaves=True)\n'
+    text+= 'scheduler = AvalancheSchedulerSvc(ThreadPoolSize=threads)\n'
+    text+= 'eventloop = HiveSlimEventLoopMgr(SchedulerName="AvalancheSchedulerSvc")\n\n'
+    algs = []
+    for name,options in classes:
+        var = name[0].lower()+name[1:]
+        if var in reserved:
+            var += 'Alg'
+        algs.append(var)
+        lines = ['%s = %s("%s")'%(var,name,name)]
+        found = dataLocations(options)
+        if found==None:
+            lines.insert(0,'# %s declares no data dependencies (not reentrant), the scheduler cannot order it'%name)
+        else:
+            inputs,outputs = found
+            vector = options.type=='GFA'
+            lines+= setLocations(var,inputs,vector and options.GaudiFunctional=='MergingTransformer')
+            lines+= setLocations(var,outputs,vector and options.GaudiFunctional=='SplittingTransformer')
+            missing = [loc for prop,locs in inputs for loc in locs if not loc in produced]
+            if len(missing)>0:
+                lines.insert(0,'# %s reads %s, produced by no algorithm here: add its producer or an input file'%(name,', '.join(missing)))
+        text+= '\n'.join(lines)+'\n\n'
+    text+= 'ApplicationMgr(TopAlg=[%s],\n'%', '.join(algs)
+    text+= '               EvtMax=int(os.environ.get("EVTMAX", 100)),\n'
+    text+= '               EvtSel="NONE",\n'
+    text+= '               ExtSvc=[whiteboard],\n'
+    text+= '               EventLoop=eventloop,\n'
+    text+= '               MessageSvcType="InertMessageSvc")\n'
+    return text
@@ -4,22 +4,36 @@
 # Date: 29/03/2017
 # Updated: 19/06/2017. remove useless comments
 
-import sys,os,pwd,time
+import sys,os
+import profiling
 from optparse import OptionParser
-from LHCbHeader import LHCbHeader
-from LHCbCpp import LHCbCpp
-from support import * #doxyComment,comment,exists
+from variants import render
+from support import exists
+profiling.mark('imports')
 
 
 #possibilities
 headerConfigs= { 'algorithm': ['A (Algorithm)','GFA (GaudiFunctionalAlgorithm)','DVA (DaVinciAlgorithm)','T (Tool)','I (Interface)','simple'],
                  'DVtype' : ['Normal','Histo','Tuple'],
-                 'GFtype' : ['Producer','Consumer','Transformer','MultiTransformer'],#,'SplittingTransformer','MergingTransformer','FilterPredicate','MultiTransformerFilter'
+                 'GFtype' : ['Producer','Consumer','Transformer','MultiTransformer','SplittingTransformer','MergingTransformer','FilterPredicate','MultiTransformerFilter'],
                  'NAtype' : ['Normal','Histo','Tuple'],
                  'GFInheritance': []
                  }
+#short codes for the GaudiFunctional types, as used on the command line
+GFCodes = {'Transformer':'T','Producer':'P','Consumer':'C','MultiTransformer':'M',
+           'SplittingTransformer':'S','MergingTransformer':'MG','FilterPredicate':'F','MultiTransformerFilter':'MF'}
+GFNames = dict((code,gtype) for gtype,code in GFCodes.items())
+#default operator() signature per GaudiFunctional type, (input, output), for what -i/-o leave unset
+GFSignatures = {'Transformer':('const INPUT','OUTPUT'),
+                'Producer':(None,'OUTPUT'),
+                'Consumer':('const INPUT','void'),
+                'MultiTransformer':('const InputDataStruct','std::tuple<OUTPUT1,OUTPUT2>'),
+                'SplittingTransformer':('const INPUT','std::vector<OUTPUT>'),
+                'MergingTransformer':('const Gaudi::Functional::vector_of_const_<INPUT>','OUTPUT'),
+                'FilterPredicate':('const INPUT','bool'),
+                'MultiTransformerFilter':('const INPUT','std::tuple<OUTPUT1,OUTPUT2>')}
 
-def make_files(options,name):
+def parse_name(options,name):
     ###parse the name.
     #print 'name = ',name
     options.cpp = False
@@ -30,8 +44,13 @@ def make_files(options,name):
     if '.h' in name:
         options.Header = True
         name = name.split('.h')[0]
-    #case of no .cpp or h given
-        #print 'parsing .cpp'
+    #case of no .cpp or h given: make both
+    if options.cpp==False and options.Header==False:
+        options.cpp = True
+        options.Header = True
+    return name
+
+def parse_type(options):
     ####Type parsing. 
     ##NOTE: This is really only supported for command line, e.g. tty
     if options.type==None and options.isTTY==True:
@@ -68,65 +87,25 @@ def make_files(options,name):
     ###parse functional settings    
     
     if options.type=='GFA' and options.GaudiFunctional==None and options.isTTY==True:
-        gtype = raw_input("Transformer, Producer, Consumer, MultiTransformer [T]/P/C/M : ")#add later , MultiTransformerFilter or FilterPredicate
+        gtype = raw_input("Transformer, Producer, Consumer, MultiTransformer, SplittingTransformer, MergingTransformer, FilterPredicate, MultiTransformerFilter [T]/P/C/M/S/MG/F/MF : ").upper()
         #add possible inheritance from non-standard  base class
         nonStandardBase = raw_input('Does this inherit from a non-standard base class? Y/[N] : ').upper()
         if nonStandardBase=='Y':
             options.GFInheritance = ', Gaudi::Functional::Traits::BaseClass_t<NONSTANDARDBASE>'
         else: options.GFInheritance= ''
-        if gtype=="T" or gtype=='':
-            options.GaudiFunctional= "Transformer"
-            options.GaudiFunctionalInput = 'const INPUT'
-            options.GaudiFunctionalOutput = 'OUTPUT'
-        elif gtype=="P":
-            options.GaudiFunctional="Producer"
-            options.GaudiFunctionalOuput = 'OUTPUT'
-        elif gtype=="C":
-            options.GaudiFunctional="Consumer"
-            options.GaudiFunctionalInput = 'const INPUT'
-            options.GaudiFunctionalOutput='void'
-        elif gtype=="M":
-            options.GaudiFunctional="MultiTransformer"
-            options.GaudiFunctionalInput = 'const InputDataStruct'
-            options.GaudiFunctionalOutput= 'std::tuple<OUTPUT1,OUTPUT2>'
-        else: 
+        if not set_functional(options,gtype if not gtype=='' else 'T'):
             print 'input unknown option! cannot parse!'
             sys.exit()
     #parse if not tty
-    if options.type=='GFA' and options.isTTY==False:
+    elif options.type=='GFA' and options.isTTY==False:
         if not options.GFInheritance==None:
             options.GFInheritance = ", Gaudi::Functional::Traits::BaseClass_t<%s>"%options.GFInheritance
-        if options.GaudiFunctional=="T" or options.GaudiFunctional=='':
-            options.GaudiFunctional= "Transformer"
-            options.GaudiFunctionalInput = 'const INPUT'
-            options.GaudiFunctionalOutput = 'OUTPUT'
-        elif options.GaudiFunctional=="P":
-            options.GaudiFunctional="Producer"
-            options.GaudiFunctionalOutput = 'OUTPUT'
-        elif options.GaudiFunctional=="C":
-            options.GaudiFunctional="Consumer"
-            options.GaudiFunctionalInput = 'const INPUT'
-            options.GaudiFunctionalOutput='void'
-        elif options.GaudiFunctional=="M":
-            options.GaudiFunctional="MultiTransformer"
-            options.GaudiFunctionalInput = 'const InputDataStruct'
-            options.GaudiFunctionalOutput= 'std::tuple<OUTPUT1,OUTPUT2>'
-        else: 
-            print 'input unknown option! cannot parse!'
-
-    if options.type=='GFA' and options.isTTY==True and not options.GaudiFunctional == None:
-        
-        if options.GaudiFunctional == 'Transformer':
-            options.GaudiFunctionalInput = 'const INPUT'
-            options.GaudiFunctionalOutput = 'OUTPUT'
-        elif options.GaudiFunctional=='Producer':
-            options.GaudiFunctionalOutput = 'OUTPUT'
-        elif options.GaudiFunctional=='Consumer':
-            options.GaudiFunctionalInput = 'const INPUT'
-            options.GaudiFunctionalOutput='void'
-        elif options.GaudiFunctional=='MultiTransformer':
-            options.GaudiFunctionalInput='const InputDataStruct'
-            options.GaudiFunctionalOutput= 'std::tuple<OUTPUT1,OUTPUT2>'
+        #Transformer unless given, as batch.validate does
+        if not set_functional(options,options.GaudiFunctional if options.GaudiFunctional else 'T'):
+            print 'unknown GaudiFunctional %s, use one of %s'%(options.GaudiFunctional,headerConfigs['GFtype'])
+            sys.exit(1)
+    elif options.type=='GFA' and options.isTTY==True:
+        set_functional(options,options.GaudiFunctional)
     ###parse normal/davinci settings
 
     ##algorithm settings
@@ -139,7 +118,7 @@ def make_files(options,name):
             else: 
                 print 'input unknown option! cannot parse!'
                 sys.exit()
-        elif options.AlgorithmType==None and isTTY==False: options.AlgorithmType='Normal'
+        elif options.AlgorithmType==None and options.isTTY==False: options.AlgorithmType='Normal'
         elif options.AlgorithmType=='H': options.AlgorithmType='Histo'
         elif options.AlgorithmType=='T': options.AlgorithmType='Tuple'
         elif options.AlgorithmType=='N': options.AlgorithmType='Normal'
@@ -157,40 +136,99 @@ def make_files(options,name):
         elif options.DaVinciAlgorithmType=="H": options.DaVinciAlgorithmType='Histo'
         elif options.DaVinciAlgorithmType=="T": options.DaVinciAlgorithmType='Tuple'
         elif options.DaVinciAlgorithmType=="N": options.DaVinciAlgorithmType='Normal'
-    #good to go, make some useful things:
-    # print 'dumping info'
-    #print 'options = ', options
-    #print 'btype = ', btype
-    # print 
-    #     print 'now using options',options
-    #     print type(options)
-    
+    err = check_options(options)
+    if not err==None:
+        print err
+        sys.exit(1)
+
+def set_functional(options,gtype):
+    #GaudiFunctional type (name or code), its default signature where not given, False if unknown
+    gtype = GFNames.get(gtype,gtype)
+    if not gtype in GFSignatures:
+        return False
+    options.GaudiFunctional = gtype
+    finput,foutput = GFSignatures[gtype]
+    if options.GaudiFunctionalInput==None:
+        options.GaudiFunctionalInput = finput
+    if options.GaudiFunctionalOutput==None:
+        options.GaudiFunctionalOutput = foutput
+    return True
+
+def check_options(options):
+    #combinations there is no skeleton for, returns what is wrong or None
+    subtype = {'A':options.AlgorithmType,'DVA':options.DaVinciAlgorithmType}.get(options.type)
+    if options.reentrant==True and subtype in ['H','T','Histo','Tuple']:
+        return 'Histo and Tuple algorithms cannot be reentrant!'
+    gtype = GFNames.get(options.GaudiFunctional,options.GaudiFunctional)
+    if options.soa==True and (not options.type=='GFA' or gtype in ['Consumer','FilterPredicate']):
+        return 'structure of arrays needs a GaudiFunctional with an output!'
+    if options.timing==True and not options.type in ['A','DVA','GFA']:
+        return 'timing needs an algorithm (A, DVA or GFA)!'
+    if options.bench==True and not options.type=='GFA':
+        return 'benchmark drivers are only generated for GaudiFunctional algorithms!'
+    if options.hiveOptions==True and not options.type in ['A','DVA','GFA']:
+        return 'job options are only generated for algorithms (A, DVA or GFA)!'
+    if any(not n==None and n<1 for n in [options.threads,options.slots]):
+        return 'threads and slots have to be at least 1!'
+    return None
+
+def generate(options,name):
+    #render the requested files, returns a list of (filename, text)
+    #name may carry a directory, the class is named after the file
+    ret = []
+    cls = os.path.basename(name)
     if options.Header==True and not exists(name+'.h'):
-        thing = LHCbHeader(name,options)
-        ret = thing.genText
-        if options.write==True:
-            f_dot_h = open(name+'.h','w')
-            f_dot_h.write(ret)
-        print ret
+        ret.append((name+'.h',render(options,cls,'h')))
     else: pass#print name+'.h exists!'
-    # print '-'*50
-    # print 'Generating cpp'
-    # print '-'*50
-    
-    
-    if options.cpp==True and not exists(name+'.cpp'):
-        thing2 = LHCbCpp(name,options)
-        if options.write==True:
-            f_dot_cpp = open(name+'.cpp','w')
-            f_dot_cpp.write(thing2.genText)
-            f_dot_cpp.close()
-        print thing2.genText
+    #interfaces are header only
+    if options.cpp==True and not options.type=='I' and not exists(name+'.cpp'):
+        ret.append((name+'.cpp',render(options,cls,'cpp')))
     else: pass
+    #benchmark driver, and the CMake target building it
+    if options.bench==True and options.cpp==True and not exists(name+'Bench.cpp'):
+        from LHCbBench import benchStanza
+        ret.append((name+'Bench.cpp',render(options,cls,'bench')))
+        ret.append((name+'Bench.cmake',benchStanza(cls)))
+    #multithreaded job options running the class
+    if options.hiveOptions==True and not exists(name+'Options.py'):
+        from LHCbOptions import hiveOptions
+        ret.append((name+'Options.py',hiveOptions([(cls,options)],options.threads,options.slots)))
+    return ret
+
+def make_files(options,name):
+    with profiling.stage('class',cls=name):
+        return make_class(options,name)
+
+def make_class(options,name):
+    name = parse_name(options,name)
+    with profiling.stage('parse'):
+        parse_type(options)
+    if not options.index==None:
+        from classindex import collisions
+        with profiling.stage('class index'):
+            found = collisions(options.index,name)
+        for path,kind,line in found:
+            print '%s already declared (%s) in %s:%d'%(os.path.basename(name),kind,path,line)
+        if len(found)>0:
+            return 1
+    if options.update==True:
+        from incremental import update, report, saveManifests
+        report(update(options,name))
+        saveManifests()
+        return
+    for fname,text in generate(options,name):
+        if options.write==True:
+            with profiling.stage('write',file=fname):
+                profiling.count('open')
+                f_out = open(fname,'w')
+                f_out.write(text)
+                f_out.close()
+        print text
 
 #parse options    
 #classes for header and .cpp file.
 
-if __name__ == "__main__":
+def make_parser():
     usage = "usage: %prog [options] name"
     parser = OptionParser( usage = usage )
     parser.add_option('-t','--type',action='store',dest='type',help="Create Algorithm type %s"%headerConfigs['algorithm'])
@@ -198,17 +236,58 @@ if __name__ == "__main__":
     parser.add_option('-d','--DaVinciAlgorithmType',action='store',help='DaVinci Algorithm type %s'%headerConfigs['DVtype'])
     parser.add_option('-a','--AlgorithmType',action='store',help = 'Normal Algorithm type %s'%headerConfigs['NAtype'])
     parser.add_option('-I','--Interface', action='store', help = 'Interface (name interpreted for use here)')
-    parser.add_option('-T','--Tool', action='store',help = 'Tool (can also provide -i flag too)')
+    parser.add_option('-T','--Tool', action='store',help = 'Tool interfaces used by the class, comma separated (included by the header, or forward declared with --lean)')
+    parser.add_option('--lean', action='store_true',help='Keep includes out of the headers where possible: forward declare the -T interfaces and include them in the .cpp only')
+    parser.add_option('--pch', action='store',help='Precompiled header included first by every .cpp')
     parser.add_option('-i','--GaudiFunctionalInput',action='store',help='Input for Gaudi Functional Algorithm')
     parser.add_option('-o','--GaudiFunctionalOutput',action='store',help='Output for Gaudi Functional Algorithm')
+    parser.add_option('--inputLocations', action='store',dest='GaudiFunctionalInputLocations',help='Gaudi Functional input locations, comma separated (paths, or constants like LHCb::TrackLocation::Default)')
+    parser.add_option('--outputLocations', action='store',dest='GaudiFunctionalOutputLocations',help='Gaudi Functional output locations, comma separated')
     parser.add_option('-W','--write', action='store_true',help='Use the python script to write the output')
     parser.add_option('-n','--GFInheritance', action='store',help='Give a non-standard base with GaudiFunctional')
-    (options, args) = parser.parse_args()
+    parser.add_option('--soa', action='store_true',help='GaudiFunctional output types as structures of arrays, reserved up front and moved out of operator()')
+    parser.add_option('--timing', action='store_true',help='Time execute()/operator() into a Gaudi::Accumulators counter, printed with the other counters at finalize (compile with -DNO_ALGORITHM_TIMING to remove it)')
+    parser.add_option('--bench', action='store_true',help='With a GaudiFunctional, also write <name>Bench.cpp calling operator() on synthetic inputs of several sizes and thread counts, and <name>Bench.cmake with its CMake target')
+    parser.add_option('--options', action='store_true',dest='hiveOptions',help='Also write <name>Options.py running the algorithm multithreaded (Hive whiteboard, scheduler and event loop) with its data locations set')
+    parser.add_option('--threads', action='store',type='int',help='Default thread pool size of the --options file (4 if not given, THREADS=n when running)')
+    parser.add_option('--slots', action='store',type='int',help='Default number of event slots of the --options file (threads+1 if not given, SLOTS=n when running)')
+    parser.add_option('-r','--reentrant', action='store_true',help='Thread-safe A or DVA for multithreaded (Hive) running: const execute(const EventContext&), data handles and counters (GFA are always)')
+    parser.add_option('-m','--manifest', action='store',help='Generate all classes listed in a manifest file (.json, or one set of command line arguments per line; - for stdin)')
+    parser.add_option('-U','--update', action='store_true',help='Write only files whose content changes, keeping track of generated files in .lhcbskeleton.json (edited files are never overwritten)')
+    parser.add_option('--refresh', action='store',help='Re-render every generated file recorded under this directory, e.g. after a skeleton update')
+    parser.add_option('--index', action='store',default=os.environ.get('LHCBSKELETON_INDEX'),help='Refuse names already declared anywhere under this project directory (default $LHCBSKELETON_INDEX)')
+    parser.add_option('--profile', action='store',default=os.environ.get('LHCBSKELETON_PROFILE'),help='Write a Chrome trace (chrome://tracing) of the time spent per stage and class to this file (default $LHCBSKELETON_PROFILE)')
+    parser.add_option('-j','--jobs', action='store',type='int',help='Number of workers writing files in manifest mode (default: number of cpus)')
+    return parser
 
-    options.isTTY = (os.isatty(0)) and (os.isatty(1)) and (os.isatty(2))
+def main(argv,isTTY=False):
+    parser = make_parser()
+    (options, args) = parser.parse_args(argv)
+    profiling.mark('options')
+    session = None
+    if not options.profile==None:
+        session = profiling.enable(options.profile)
+    try:
+        with profiling.stage('main'):
+            return run_main(options,args,isTTY)
+    finally:
+        profiling.finish(session)
 
+def run_main(options,args,isTTY):
+    options.isTTY = isTTY
+
+    if not options.refresh==None:
+        from incremental import refresh, report, saveManifests
+        report(refresh(options.refresh))
+        saveManifests()
+        return
+    if not options.manifest==None:
+        from batch import run_manifest
+        return run_manifest(options.manifest,options.jobs,options.update,options.index)
     if len(args)==0: 
         print 'need a class name!'
-        sys.exit()
-    make_files(options,args[0])
+        return
+    return make_files(options,args[0])
 
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:],(os.isatty(0)) and (os.isatty(1)) and (os.isatty(2))))
@@ -0,0 +1,46 @@
+#!/usr/bin/python -S
+# What:  thin client for MakeLHCbCppServer.py, used by the emacs and vim integrations
+#
+# Takes exactly the same arguments as MakeLHCbCppClass.py. If a server is listening the
+# request is sent over its unix domain socket, otherwise (or when a terminal is attached,
+# since the interactive questions need it) the class is generated in this process, as it is
+# when the server does not answer within timeout seconds.
+# Only needs the standard library modules imported below when a server answers.
+
+import sys,os,socket,json
+
+timeout = 10
+
+def socketPath():
+    return os.environ.get('LHCBSKELETON_SOCKET','/tmp/lhcbskeleton-%d.sock'%os.getuid())
+
+def request(argv,path=None,wait=None):
+    #returns (status, text), or None if no server is listening or it does not answer in time
+    sock = socket.socket(socket.AF_UNIX,socket.SOCK_STREAM)
+    sock.settimeout(wait if wait else timeout)
+    try:
+        sock.connect(path if path else socketPath())
+        sock.sendall(json.dumps({'args':argv,'cwd':os.getcwd()})+'\n')
+        reply = sock.makefile('r').readline()
+    except (socket.error,UnicodeError):
+        #UnicodeError: arguments that are not utf-8, left to MakeLHCbCppClass.py
+        return None
+    finally:
+        sock.close()
+    if reply=='':
+        return None
+    reply = json.loads(reply)
+    return reply['status'],reply['text']
+
+if __name__ == "__main__":
+    isTTY = (os.isatty(0)) and (os.isatty(1)) and (os.isatty(2))
+    reply = None
+    if not isTTY:
+        reply = request(sys.argv[1:])
+    if reply==None:
+        sys.path.insert(0,os.path.dirname(os.path.abspath(__file__)))
+        from MakeLHCbCppClass import main
+        sys.exit(main(sys.argv[1:],isTTY))
+    status,text = reply
+    sys.stdout.write(text.encode('utf-8'))
+    sys.exit(status)
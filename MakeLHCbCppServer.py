@@ -0,0 +1,89 @@
+#!/usr/bin/python
+# What:  long lived generator daemon for the emacs and vim integrations
+#
+# Keeps the generator modules and the raw_skeletons loaded and answers requests from
+# MakeLHCbCppClient.py on a unix domain socket ($LHCBSKELETON_SOCKET or /tmp/lhcbskeleton-<uid>.sock).
+# The protocol is one JSON object per line:
+#   request:  {"args": [MakeLHCbCppClass.py arguments], "cwd": "directory of the caller"}
+#   reply:    {"status": exit code, "text": what MakeLHCbCppClass.py would have printed}
+# Arguments and text are utf-8 on both ends, as on the command line.
+# Requests are handled one at a time since each one runs in the caller's directory.
+#
+# usage: MakeLHCbCppServer.py [--socket PATH] [--idle MINUTES] &
+
+import sys,os,json,socket,signal,SocketServer
+from StringIO import StringIO
+from optparse import OptionParser
+from MakeLHCbCppClass import main
+from MakeLHCbCppClient import socketPath
+from skeletons import getRegistry
+from support import resetContext
+from classindex import resetIndexes
+
+class GeneratorHandler(SocketServer.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if line.strip()=='': continue
+            self.wfile.write(json.dumps(self.server.generate(json.loads(line)))+'\n')
+            self.wfile.flush()
+
+class GeneratorServer(SocketServer.UnixStreamServer):
+    idle = False
+    def handle_timeout(self):
+        self.idle = True
+
+    def generate(self,req):
+        #run MakeLHCbCppClass as if called from req['cwd'], capturing its output
+        out = StringIO()
+        status = 0
+        stdout,stderr = sys.stdout,sys.stderr
+        sys.stdout,sys.stderr = out,out
+        try:
+            os.chdir(req.get('cwd','/'))
+            resetContext()
+            resetIndexes()
+            status = main([arg.encode('utf-8') if isinstance(arg,unicode) else str(arg) for arg in req.get('args',[])])
+        except SystemExit,e:
+            status = e.code
+        except Exception,e:
+            print 'MakeLHCbCppServer: %s: %s'%(e.__class__.__name__,e)
+            status = 1
+        finally:
+            sys.stdout,sys.stderr = stdout,stderr
+        if not isinstance(status,int):
+            status = 0 if status==None else 1
+        return {'status':status,'text':out.getvalue().decode('utf-8','replace')}
+
+def serve(path,idle=None):
+    #refuse to start twice, but clean up after a server that died
+    if os.path.exists(path):
+        sock = socket.socket(socket.AF_UNIX,socket.SOCK_STREAM)
+        try:
+            sock.connect(path)
+            sock.close()
+            print 'a server is already listening on %s'%path
+            return 1
+        except socket.error:
+            os.unlink(path)
+    getRegistry().readAll()
+    oldmask = os.umask(0077)
+    server = GeneratorServer(path,GeneratorHandler)
+    os.umask(oldmask)
+    server.timeout = idle
+    signal.signal(signal.SIGTERM,lambda signum,frame: sys.exit(0))
+    try:
+        while not server.idle:
+            server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.unlink(path)
+    return 0
+
+if __name__ == "__main__":
+    parser = OptionParser( usage = "usage: %prog [options]" )
+    parser.add_option('-s','--socket', action='store',default=socketPath(),help='Unix domain socket to listen on (default %default)')
+    parser.add_option('--idle', action='store',type='float',help='Exit after this many minutes without requests')
+    (options, args) = parser.parse_args()
+    sys.exit(serve(options.socket,options.idle*60 if options.idle else None))
@@ -0,0 +1,96 @@
+#!/usr/bin/python
+# What:  in-process generation API, for python tools generating classes without a subprocess each
+#
+#   from api import ClassSpec, generate, render
+#   spec = ClassSpec('MyAlg', type='A', AlgorithmType='H')
+#   for fname,text in generate(spec):     # [('MyAlg.h', ...), ('MyAlg.cpp', ...)]
+#       ...
+#   render(spec,'h',out=f_out)            # or into any object with a write() method
+# A ClassSpec takes the MakeLHCbCppClass option names (and the same short codes) and is
+# validated and normalised once, as parse_type does for the command line; it cannot be changed
+# afterwards. author, date and package default to the current user, today and the current
+# directory. Nothing is printed, no file is opened and neither the spec nor anything shared is
+# modified, so any number of threads can render at the same time.
+
+from variants import specFields
+import variants
+from support import doxyComment,generationContext
+
+class ClassSpec(object):
+    __slots__ = ['name']+specFields+['author','date','package']
+
+    def __init__(self,name,type='S',author=None,date=None,package=None,**options):
+        from optparse import Values
+        from MakeLHCbCppClass import parse_type, check_options, GFCodes, headerConfigs
+        from batch import typeCodes, subTypeCodes, identifier
+        for key in options:
+            if not key in specFields:
+                raise TypeError('unknown ClassSpec field %s'%key)
+        if not identifier.match(str(name)):
+            raise ValueError('%s is not a valid class name'%name)
+        if not type in typeCodes:
+            raise ValueError('unknown type %s, use one of %s'%(type,typeCodes))
+        for field,ctype in [('AlgorithmType','A'),('DaVinciAlgorithmType','DVA')]:
+            if type==ctype and not options.get(field) in [None]+subTypeCodes:
+                raise ValueError('unknown %s %s'%(field,options[field]))
+        if type=='GFA':
+            gtype = GFCodes.get(options.get('GaudiFunctional'),options.get('GaudiFunctional'))
+            if not gtype in [None]+GFCodes.values():
+                raise ValueError('unknown GaudiFunctional %s, use one of %s'%(gtype,headerConfigs['GFtype']))
+            options['GaudiFunctional'] = gtype if not gtype==None else 'T'
+        parsed = Values(dict((field,options.get(field)) for field in specFields))
+        parsed.type = type
+        parsed.isTTY = False
+        if not check_options(parsed)==None:
+            raise ValueError(check_options(parsed))
+        parse_type(parsed)
+        setField = super(ClassSpec,self).__setattr__
+        setField('name',str(name))
+        for field in specFields:
+            setField(field,getattr(parsed,field))
+        setField('author',author)
+        setField('date',date)
+        setField('package',package)
+
+    def __setattr__(self,name,value):
+        raise AttributeError('ClassSpec is immutable')
+
+    def __delattr__(self,name):
+        raise AttributeError('ClassSpec is immutable')
+
+    def __repr__(self):
+        return 'ClassSpec(%s)'%', '.join('%s=%r'%(field,getattr(self,field)) for field in self.__slots__
+                                          if not getattr(self,field)==None)
+
+def context(spec):
+    author,date,package = spec.author,spec.date,spec.package
+    if None in [author,date,package]:
+        generation = generationContext()
+        author = author if not author==None else generation.author
+        date = date if not date==None else generation.date
+        package = package if not package==None else generation.package
+    return {'comment':doxyComment(first=True, text = spec.name, author = author, date = date, package = package),
+            'date':date,'author':author}
+
+def render(spec,ext,out=None):
+    #text of the header (ext h), source (ext cpp) or benchmark (ext bench) file, also written to out if given
+    text = variants.render(spec,spec.name,ext,context(spec))
+    if not out==None:
+        out.write(text)
+    return text
+
+def generate(spec,header=True,source=True):
+    #returns [(filename, text)]; interfaces are header only
+    ret = []
+    if header:
+        ret.append((spec.name+'.h',render(spec,'h')))
+    if source and not spec.type=='I':
+        ret.append((spec.name+'.cpp',render(spec,'cpp')))
+    if source and spec.bench==True:
+        from LHCbBench import benchStanza
+        ret.append((spec.name+'Bench.cpp',render(spec,'bench')))
+        ret.append((spec.name+'Bench.cmake',benchStanza(spec.name)))
+    if spec.hiveOptions==True:
+        from LHCbOptions import hiveOptions
+        ret.append((spec.name+'Options.py',hiveOptions([(spec.name,spec)],spec.threads,spec.slots)))
+    return ret
@@ -0,0 +1,195 @@
+#!/usr/bin/python
+# What:  manifest (batch) mode for MakeLHCbCppClass.py, generating many classes in one process
+#
+# A manifest is either a .json file holding a list of objects (or {"classes": [...]})
+# whose keys are the MakeLHCbCppClass option names plus "name", e.g.
+#   [{"name": "MyAlg", "type": "A", "AlgorithmType": "H"},
+#    {"name": "MyTool", "type": "T", "Interface": "IMyTool"}]
+# (values as on the command line: strings, numbers for threads/slots/jobs, true/false for flags)
+# or a text file (or - for stdin) with the command line arguments for one class per line, e.g.
+#   -t GFA -f P MyProducer
+#   -t DVA -d T MyTupleAlg.h   # only the header
+# A name without .h/.cpp generates both files. Everything is validated before anything is written.
+# With -U (also per line) files are written incrementally, see incremental.py.
+
+import sys,os,re,json,shlex
+from optparse import OptionValueError
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
+from MakeLHCbCppClass import make_parser, parse_name, parse_type, check_options, generate, headerConfigs, GFCodes
+from incremental import update, report, saveManifests
+from classindex import collisions
+import profiling
+
+#values accepted non-interactively, see parse_type
+typeCodes = ['A','GFA','DVA','T','I','S']
+subTypeCodes = ['N','H','T']+headerConfigs['NAtype']
+identifier = re.compile(r'^[A-Za-z_]\w*$')
+
+def entry_options(parser,entry):
+    #options of a .json manifest entry, converted as the command line would, and what is wrong with it
+    options = parser.get_default_values()
+    options.manifestErrors = []
+    if not isinstance(entry,dict):
+        options.manifestErrors.append('not an object: %s'%json.dumps(entry))
+        return options,None
+    known = dict((opt.dest,opt) for opt in parser.option_list if not opt.dest==None)
+    name = None
+    for key,val in sorted(entry.items()):
+        key = key.encode('utf-8')
+        if isinstance(val,unicode):
+            val = val.encode('utf-8')
+        if key=='name':
+            if isinstance(val,str):
+                name = val
+            else:
+                options.manifestErrors.append('name has to be a string, not %s'%json.dumps(val))
+        elif not key in known:
+            options.manifestErrors.append('unknown manifest key %s'%key)
+        elif known[key].action=='store_true':
+            if isinstance(val,bool) or val==None:
+                setattr(options,key,val or None)
+            else:
+                options.manifestErrors.append('%s has to be true or false, not %s'%(key,json.dumps(val)))
+        elif val==None:
+            setattr(options,key,None)
+        elif known[key].type=='string':
+            if isinstance(val,str):
+                setattr(options,key,val)
+            else:
+                options.manifestErrors.append('%s has to be a string, not %s'%(key,json.dumps(val)))
+        else:
+            try:
+                #as given on the command line: "8" and 8 are fine, true or 8.5 are not
+                setattr(options,key,known[key].check_value(key,str(val)))
+            except OptionValueError,e:
+                options.manifestErrors.append(str(e))
+    return options,name
+
+def read_manifest(path):
+    #returns a list of [options, name] pairs, one per class
+    parser = make_parser()
+    if path=='-':
+        text = sys.stdin.read()
+    else:
+        f_in = open(path,'r')
+        text = f_in.read()
+        f_in.close()
+    specs = []
+    if path.endswith('.json'):
+        entries = json.loads(text)
+        if isinstance(entries,dict):
+            entries = entries.get('classes',[])
+        if not isinstance(entries,list):
+            print 'manifest %s has to hold a list of classes'%path
+            sys.exit(1)
+        for entry in entries:
+            specs.append(list(entry_options(parser,entry)))
+    else:
+        for line in text.splitlines():
+            line = line.split('#')[0].strip()
+            if line=='': continue
+            (options,args) = parser.parse_args(shlex.split(line))
+            specs.append([options,(args[0] if len(args)>0 else None)])
+    return specs
+
+def validate(specs):
+    #check (and normalise) every spec, returns a list of error messages
+    errors = []
+    seen = {}
+    for num,spec in enumerate(specs):
+        options,name = spec
+        where = 'entry %d'%(num+1)
+        #what read_manifest could not convert
+        problems = getattr(options,'manifestErrors',[])
+        errors+= ['%s%s: %s'%(where,' (%s)'%name if name else '',err) for err in problems]
+        if not name:
+            if len(problems)==0:
+                errors.append('%s: need a class name!'%where)
+            continue
+        options.isTTY = False
+        options.manifest = None
+        name = parse_name(options,name)
+        spec[1] = name
+        where += ' (%s)'%name
+        if not identifier.match(os.path.basename(name)):
+            errors.append('%s: not a valid class name'%where)
+        if name in seen:
+            errors.append('%s: duplicate of entry %d'%(where,seen[name]))
+        seen[name] = num+1
+        if not options.index==None:
+            for path,kind,line in collisions(options.index,name):
+                errors.append('%s: already declared (%s) in %s:%d'%(where,kind,path,line))
+        if options.type==None:
+            options.type = 'S'
+        if not options.type in typeCodes:
+            errors.append('%s: unknown type %s, use one of %s'%(where,options.type,typeCodes))
+        elif options.type=='A' and not options.AlgorithmType in [None]+subTypeCodes:
+            errors.append('%s: unknown AlgorithmType %s'%(where,options.AlgorithmType))
+        elif options.type=='DVA' and not options.DaVinciAlgorithmType in [None]+subTypeCodes:
+            errors.append('%s: unknown DaVinciAlgorithmType %s'%(where,options.DaVinciAlgorithmType))
+        elif options.type=='GFA':
+            gtype = GFCodes.get(options.GaudiFunctional,options.GaudiFunctional)
+            if gtype==None:
+                gtype = 'T'
+            if not gtype in GFCodes.values():
+                errors.append('%s: unknown GaudiFunctional %s, use one of %s'%(where,options.GaudiFunctional,headerConfigs['GFtype']))
+            options.GaudiFunctional = gtype
+        if not check_options(options)==None:
+            errors.append('%s: %s'%(where,check_options(options)))
+    return errors
+
+def write_spec(spec):
+    with profiling.stage('class',cls=spec[1]):
+        return write_class(spec)
+
+def write_class(spec):
+    options,name = spec
+    if options.update==True:
+        return update(options,name)
+    written = []
+    for fname,text in generate(options,name):
+        with profiling.stage('write',file=fname):
+            profiling.count('open')
+            f_out = open(fname,'w')
+            f_out.write(text)
+            f_out.close()
+        written.append((fname,'written'))
+    return written
+
+def run_manifest(path,jobs=None,update=False,index=None):
+    #update and index given on the command line apply to every entry
+    with profiling.stage('read manifest'):
+        specs = read_manifest(path)
+    for options,name in specs:
+        if update==True:
+            options.update = True
+        if options.index==None:
+            options.index = index
+    with profiling.stage('validate'):
+        errors = validate(specs)
+    if len(errors)>0:
+        for err in errors:
+            print err
+        print 'manifest %s is not valid, nothing generated'%path
+        return 1
+    for options,name in specs:
+        parse_type(options)
+        dirname = os.path.dirname(name)
+        if not dirname=='' and not os.path.isdir(dirname):
+            os.makedirs(dirname)
+    pool = ThreadPool(jobs if jobs else cpu_count())
+    try:
+        written = pool.map(write_spec,specs)
+    finally:
+        pool.close()
+        pool.join()
+    saveManifests()
+    results = sum(written,[])
+    if any(options.update for options,name in specs):
+        report(results)
+        return 0
+    nrequested = sum(int(o.Header)+int(o.cpp and not o.type=='I')+2*int(o.bench==True and o.cpp)+int(o.hiveOptions==True)
+                     for o,n in specs)
+    print 'generated %d files for %d classes (%d existing files skipped)'%(len(results),len(specs),nrequested-len(results))
+    return 0
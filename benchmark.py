@@ -0,0 +1,168 @@
+#!/usr/bin/python
+# What:  benchmark of the generator over every variant of headerConfigs
+#
+# Reports, per variant, the cold start latency of the command line (a fresh interpreter, as the
+# editors call it) and the in-process time per make_files call, plus the throughput of a
+# manifest run in classes/sec. Results can be stored and later compared against:
+#   benchmark.py --save baseline.json
+#   benchmark.py --compare baseline.json --threshold 0.25   (exit 1 if anything got slower)
+# The start-up alone (process start until make_files is entered, from the profiling trace) can
+# be checked against a fixed budget, to catch imports creeping back into the command line:
+#   benchmark.py --startup-budget 40   (ms, exit 1 if the median is over it)
+
+import sys,os,time,json,shutil,tempfile,subprocess
+from optparse import OptionParser
+from MakeLHCbCppClass import make_parser, make_files
+from variants import variantArgs
+from batch import run_manifest
+
+here = os.path.dirname(os.path.abspath(__file__))
+
+def median(values):
+    values = sorted(values)
+    return values[len(values)/2]
+
+def quiet(func,*args):
+    #run func with stdout going nowhere
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull,'w')
+    try:
+        return func(*args)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+def coldStart(argv,repeat):
+    devnull = open(os.devnull,'r+')
+    times = []
+    for i in range(repeat):
+        start = time.time()
+        subprocess.call([sys.executable,here+'/MakeLHCbCppClass.py']+argv+['BenchClass'],
+                        stdin=devnull,stdout=devnull,stderr=devnull)
+        times.append(time.time()-start)
+    devnull.close()
+    return median(times)
+
+def startupTime(argv,repeat):
+    devnull = open(os.devnull,'r+')
+    tmpdir = tempfile.mkdtemp(prefix='lhcbskeleton-startup-')
+    trace = os.path.join(tmpdir,'trace.json')
+    env = dict(os.environ,LHCBSKELETON_PROFILE=trace)
+    times = []
+    try:
+        for i in range(repeat):
+            subprocess.call([sys.executable,here+'/MakeLHCbCppClass.py']+argv+['BenchClass'],
+                            stdin=devnull,stdout=devnull,stderr=devnull,env=env)
+            f_in = open(trace,'r')
+            events = [event for event in json.loads(f_in.read())['traceEvents'] if event['ph']=='X']
+            f_in.close()
+            os.unlink(trace)
+            start = min(event['ts'] for event in events)
+            times.append(min(event['ts'] for event in events if event['name']=='class')/1e6-start/1e6)
+    finally:
+        devnull.close()
+        shutil.rmtree(tmpdir)
+    return median(times)
+
+def renderTime(argv,repeat):
+    parser = make_parser()
+    times = []
+    for i in range(repeat):
+        (options, args) = parser.parse_args(argv)
+        options.isTTY = False
+        start = time.time()
+        quiet(make_files,options,'BenchClass')
+        times.append(time.time()-start)
+    return median(times)
+
+def throughput(nclasses,repeat=3):
+    #each run writes into a fresh directory, as existing files would be skipped
+    variants = variantArgs()
+    rates = []
+    for run in range(repeat):
+        lines = ['%s run%d/Bench%d'%(' '.join(variants[i%len(variants)]),run,i) for i in range(nclasses)]
+        fd,manifest = tempfile.mkstemp(suffix='.txt')
+        try:
+            f_out = os.fdopen(fd,'w')
+            f_out.write('\n'.join(lines)+'\n')
+            f_out.close()
+            start = time.time()
+            quiet(run_manifest,manifest)
+            rates.append(nclasses/(time.time()-start))
+        finally:
+            os.unlink(manifest)
+    return median(rates)
+
+def run(repeat,renderRepeat,nclasses):
+    results = {'coldstart':{},'render':{}}
+    cwd = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix='lhcbskeleton-bench-')
+    os.chdir(workdir)
+    try:
+        for argv in variantArgs():
+            label = ' '.join(argv)
+            results['coldstart'][label] = coldStart(argv,repeat)
+            results['render'][label] = renderTime(argv,renderRepeat)
+        results['throughput'] = throughput(nclasses)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir)
+    return results
+
+def show(results,baseline=None):
+    def rel(now,then):
+        return '' if then==None else '%+6.1f%%'%(100.*(now-then)/then)
+    print '%-40s %12s %8s %12s %8s'%('variant','cold [ms]','','render [ms]','')
+    for label in sorted(results['coldstart'].keys()):
+        cold,render = results['coldstart'][label],results['render'][label]
+        print '%-40s %12.2f %8s %12.4f %8s'%(label,cold*1e3,
+                                              rel(cold,baseline['coldstart'].get(label) if baseline else None),
+                                              render*1e3,
+                                              rel(render,baseline['render'].get(label) if baseline else None))
+    print 'manifest throughput: %.0f classes/sec %s'%(results['throughput'],
+                                                     rel(results['throughput'],baseline['throughput'] if baseline else None))
+
+def regressions(results,baseline,threshold):
+    #everything more than threshold (fraction) slower than the baseline
+    bad = []
+    for kind in ['coldstart','render']:
+        for label,now in results[kind].items():
+            then = baseline[kind].get(label)
+            if not then==None and now>then*(1+threshold):
+                bad.append('%s %s: %.4f s vs %.4f s'%(kind,label,now,then))
+    if results['throughput']*(1+threshold)<baseline['throughput']:
+        bad.append('throughput: %.0f vs %.0f classes/sec'%(results['throughput'],baseline['throughput']))
+    return bad
+
+if __name__ == "__main__":
+    parser = OptionParser( usage = "usage: %prog [options]" )
+    parser.add_option('-r','--repeat', action='store',type='int',default=5,help='Command line runs per variant (default %default)')
+    parser.add_option('-R','--render-repeat', action='store',type='int',default=200,help='make_files calls per variant (default %default)')
+    parser.add_option('-n','--classes', action='store',type='int',default=500,help='Classes in the manifest run (default %default)')
+    parser.add_option('--save', action='store',help='Store the results as a baseline')
+    parser.add_option('--compare', action='store',help='Compare against a stored baseline')
+    parser.add_option('--threshold', action='store',type='float',default=0.25,help='Allowed slow down w.r.t. the baseline as a fraction (default %default)')
+    parser.add_option('--startup-budget', action='store',type='float',help='Only check that the command line reaches make_files within this many ms')
+    (options, args) = parser.parse_args()
+
+    if not options.startup_budget==None:
+        startup = startupTime(['-t','A'],options.repeat)
+        print 'start-up until make_files: %.2f ms (budget %.2f ms)'%(startup*1e3,options.startup_budget)
+        sys.exit(1 if startup*1e3>options.startup_budget else 0)
+
+    results = run(options.repeat,options.render_repeat,options.classes)
+    baseline = None
+    if not options.compare==None:
+        f_in = open(options.compare,'r')
+        baseline = json.loads(f_in.read())
+        f_in.close()
+    show(results,baseline)
+    if not options.save==None:
+        f_out = open(options.save,'w')
+        f_out.write(json.dumps(results,indent=1,sort_keys=True)+'\n')
+        f_out.close()
+    if not baseline==None:
+        bad = regressions(results,baseline,options.threshold)
+        for line in bad:
+            print 'REGRESSION %s'%line
+        sys.exit(1 if len(bad)>0 else 0)
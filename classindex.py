@@ -0,0 +1,147 @@
+#!/usr/bin/python
+# What:  project wide index of class names, component factories and interface IDs
+#
+# Used by MakeLHCbCppClass.py --index DIR to refuse generating a class whose name is already
+# taken somewhere in the project (which otherwise only shows up at link or load time as a
+# duplicate DECLARE_COMPONENT). The index is cached in DIR/.lhcbskeleton-index.json; a rescan
+# lists only directories whose mtime changed and re-reads only files whose mtime changed.
+# Directories are scanned in parallel, dot directories, InstallArea and build* are skipped.
+#   classindex.py DIR [NAME ...]   (re)build the index and look up names
+
+import sys,os,re,json
+from multiprocessing.pool import ThreadPool
+from incremental import atomicWrite
+import profiling
+
+indexName = '.lhcbskeleton-index.json'
+sourceExts = ['.h','.hh','.hpp','.hxx','.icpp','.cpp','.cc','.cxx']
+patterns = [('class',re.compile(r'^\s*(?:template\s*<[^>]*>\s*)?(?:class|struct)\s+(?:\w+\s+)?(\w+)\s*(?:final\s*)?[:{]',re.M)),
+            ('component',re.compile(r'\bDECLARE_\w*(?:COMPONENT|FACTORY)\w*\s*\(\s*([\w:]+)')),
+            ('interface',re.compile(r'\bInterfaceID\s+IID_(\w+)')),
+            ('interface',re.compile(r'\bDeclareInterfaceID\s*\(\s*(\w+)'))]
+
+def skipDir(name):
+    return name.startswith('.') or name=='InstallArea' or name.startswith('build')
+
+def scanFile(path):
+    #returns [(kind, name, line)] for everything declared in path
+    f_in = open(path,'r')
+    text = f_in.read()
+    f_in.close()
+    found = []
+    for kind,pattern in patterns:
+        for match in pattern.finditer(text):
+            name = match.group(1).split('::')[-1]
+            found.append((kind,name,text.count('\n',0,match.start(1))+1))
+    return found
+
+class ClassIndex:
+    def __init__(self,root,jobs=8):
+        self.root = os.path.abspath(root)
+        self.path = os.path.join(self.root,indexName)
+        self.jobs = jobs
+        self.dirs = {}
+        self.names = {}
+        if os.path.isfile(self.path):
+            try:
+                f_in = open(self.path,'r')
+                self.dirs = json.loads(f_in.read())
+                f_in.close()
+            except ValueError:
+                self.dirs = {}
+
+    def scanDir(self,dirpath):
+        #returns (subdirectories, entry for dirpath), reusing the cached entry where possible
+        old = self.dirs.get(dirpath,{'mtime':None,'files':{},'subdirs':[]})
+        mtime = os.stat(dirpath).st_mtime
+        if mtime==old['mtime']:
+            fnames,subdirs = old['files'].keys(),old['subdirs']
+        else:
+            fnames,subdirs = [],[]
+            for name in os.listdir(dirpath):
+                path = os.path.join(dirpath,name)
+                if os.path.isdir(path) and not os.path.islink(path):
+                    if not skipDir(name):
+                        subdirs.append(name)
+                elif os.path.splitext(name)[1] in sourceExts:
+                    fnames.append(name)
+        files = {}
+        for name in fnames:
+            path = os.path.join(dirpath,name)
+            try:
+                fmtime = os.stat(path).st_mtime
+                cached = old['files'].get(name)
+                if not cached==None and cached['mtime']==fmtime:
+                    files[name] = cached
+                else:
+                    files[name] = {'mtime':fmtime,'found':scanFile(path)}
+            except (IOError,OSError):
+                pass
+        return [os.path.join(dirpath,d) for d in subdirs],{'mtime':mtime,'files':files,'subdirs':subdirs}
+
+    def update(self):
+        #rescan the tree level by level, each level in parallel
+        dirs = {}
+        pool = ThreadPool(self.jobs)
+        try:
+            todo = [self.root]
+            while len(todo)>0:
+                results = pool.map(self.scanDir,todo)
+                nexttodo = []
+                for dirpath,(subdirs,entry) in zip(todo,results):
+                    dirs[dirpath] = entry
+                    nexttodo += subdirs
+                todo = nexttodo
+        finally:
+            pool.close()
+            pool.join()
+        self.dirs = dirs
+        self.names = {}
+        for dirpath,entry in dirs.items():
+            for fname,fentry in entry['files'].items():
+                for kind,name,line in fentry['found']:
+                    self.names.setdefault(name,[]).append((os.path.join(dirpath,fname),kind,line))
+        return self
+
+    def save(self):
+        try:
+            atomicWrite(self.path,json.dumps(self.dirs))
+        except (IOError,OSError):
+            pass
+
+    def lookup(self,name,exclude=[]):
+        #returns [(path, kind, line)] declaring name, ignoring the files in exclude
+        exclude = [os.path.abspath(path) for path in exclude]
+        return [hit for hit in self.names.get(name,[]) if not hit[0] in exclude]
+
+indexes = {}
+stale = set()
+def getIndex(root):
+    #one up to date index per root and request, rescanned (only what changed) once per request
+    root = os.path.abspath(root)
+    if not root in indexes or root in stale:
+        index = indexes[root] if root in indexes else ClassIndex(root)
+        with profiling.stage('class index update',root=root):
+            indexes[root] = index.update()
+        index.save()
+        stale.discard(root)
+    return indexes[root]
+
+def resetIndexes():
+    #start of a new request (MakeLHCbCppServer.py): the tree may have changed since the last one
+    stale.update(indexes)
+
+def collisions(root,name):
+    #where the class generated as name (.h/.cpp, may carry a directory) is already declared
+    cls = os.path.basename(name)
+    return getIndex(root).lookup(cls,exclude=[name+ext for ext in sourceExts])
+
+if __name__ == "__main__":
+    if len(sys.argv)<2:
+        print 'usage: classindex.py DIR [NAME ...]'
+        sys.exit(1)
+    index = getIndex(sys.argv[1])
+    print '%d files in %d directories indexed'%(sum(len(d['files']) for d in index.dirs.values()),len(index.dirs))
+    for name in sys.argv[2:]:
+        for path,kind,line in index.lookup(name):
+            print '%s:%d: %s %s'%(path,line,kind,name)
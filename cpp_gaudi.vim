@@ -49,6 +49,11 @@
 "   behave okay in my tests
 " - Interfaces for Tools and inputs/outputs for Functional algorithms are
 "   remembered, and offered as completion alternatives on subsequent runs
+" @date 2026-10-18
+" - use MakeLHCbCppClient.py when installed next to MakeLHCbCppClass.py, so a
+"   running MakeLHCbCppServer.py saves the python start-up on every insertion
+" - offer SplittingTransformer, MergingTransformer, FilterPredicate and
+"   MultiTransformerFilter again, now that MakeLHCbCppClass supports them
 "
 " @note This script builds on ideas in earlier work by Kurt Rinnert who
 " 'rolled his own' at some point in the past which has been passed around by
@@ -70,14 +75,12 @@ let s:GaudiTypes=["Algorithm", "DaVinciAlg", "Functional",
 \               "Interface", "Tool"]
 " dictionary mapping Gaudi entity types to their subtypes
 let s:GaudiSubtypes={ 'Functional': [ "Producer",
-\           "Consumer", "Transformer", "MultiTransformer" ],
+\           "Consumer", "Transformer", "MultiTransformer",
+\           "SplittingTransformer", "MergingTransformer",
+\           "FilterPredicate", "MultiTransformerFilter"],
 \           'Algorithm': ['Normal', 'Histo', 'Tuple'],
 \           'DaVinciAlg': ['Normal', 'Histo', 'Tuple'],
 \           'Tool': ['Normal', 'Histo', 'Tuple'] }
-" FIXME: add these back to Functional subtypes when Adam's script starts
-"        to support these again
-"\           "SplittingTransformer", "MergingTransformer",
-"\           "FilterPredicate", "MultiTransformerFilter"],
 let s:GaudiCmdLineTypeMap={ 'Algorithm': 'A', 'DaVinciAlg': 'DVA',
 \           'Functional': 'GFA', 'Tool': 'T', 'Interface': 'I' }
 " dictionary for the option used for subtypes (depending on differnt types)
@@ -108,6 +111,12 @@ function! s:GaudiFindPythonScript(vimscriptpath)
     for l:path in l:scriptpathlist
         if getfperm(l:path) =~ 'r.\+x'
             let s:scriptpath=l:path
+            " prefer the client next to it: it asks a running
+            " MakeLHCbCppServer.py, and falls back to doing the work itself
+            let l:clientpath=fnamemodify(l:path, ':h') . "/MakeLHCbCppClient.py"
+            if getfperm(l:clientpath) =~ 'r.\+x'
+                let s:scriptpath=l:clientpath
+            endif
             return
         endif
     endfor
@@ -316,12 +325,7 @@ function! s:GaudiGuessFunctionalAlg(dict)
         let l:dict['subtype'] = "Consumer"
     elseif 1 == l:nOut && 0 < l:nIn
         if l:dict['outputs'] =~ '^\(bool\|Bool\|Bool_t\)$'
-            " FIXME: Adam's script seems to have scrapped support for
-            " FilterPredicate, so we disable the mapping that the script
-            " cannot seem to handle, and go with the logic that something with
-            " inputs and exactly one output is a Transformer, too...
-            "let l:dict['subtype'] = 'FilterPredicate'
-            let l:dict['subtype'] = 'Transformer'
+            let l:dict['subtype'] = 'FilterPredicate'
         else
             let l:dict['subtype'] = 'Transformer'
         endif
@@ -0,0 +1,88 @@
+#!/usr/bin/python
+# What:  include cost of generated files: how many headers, and lines, the compiler reads for each
+#
+# Follows the #include directives transitively against an include path (-I, as given to the
+# compiler; quoted includes are looked up next to the including file first) and counts every
+# header once per file, as include guards and #pragma once would. Includes not found under the
+# path (e.g. the standard library, unless a directory for it is given) are counted as unresolved
+# and not followed. Comparing the numbers of a class with and without --lean, or over time
+# (--json), shows what the generated code costs to compile.
+#   includecost.py -I $GAUDI/include -I stubs MyAlg.h MyAlg.cpp
+#   includecost.py -I stubs --json cost.json *.cpp
+
+import sys,os,re,json
+from optparse import OptionParser
+
+includeLine = re.compile(r'^\s*#\s*include\s*([<"])([^>"]+)[>"]',re.M)
+blockComment = re.compile(r'/\*.*?\*/',re.S)
+
+class IncludeGraph:
+    def __init__(self,paths):
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.files = {}
+
+    def scan(self,path):
+        #returns (lines, [(quoted, name)]) of path, read once per path
+        if not path in self.files:
+            f_in = open(path,'r')
+            text = f_in.read()
+            f_in.close()
+            found = [(kind=='"',name.strip()) for kind,name in includeLine.findall(blockComment.sub('',text))]
+            self.files[path] = (text.count('\n'),found)
+        return self.files[path]
+
+    def resolve(self,name,quoted,fromdir):
+        dirs = ([fromdir] if quoted else [])+self.paths
+        for dirname in dirs:
+            path = os.path.join(dirname,name)
+            if os.path.isfile(path):
+                return os.path.realpath(path)
+        return None
+
+    def cost(self,path):
+        #returns {'headers', 'lines', 'unresolved'} for compiling (or including) path
+        path = os.path.realpath(path)
+        seen = set([path])
+        todo = [path]
+        lines = 0
+        unresolved = set()
+        while len(todo)>0:
+            current = todo.pop()
+            nlines,found = self.scan(current)
+            lines += nlines
+            for quoted,name in found:
+                header = self.resolve(name,quoted,os.path.dirname(current))
+                if header==None:
+                    unresolved.add(name)
+                elif not header in seen:
+                    seen.add(header)
+                    todo.append(header)
+        return {'headers':len(seen)-1,'lines':lines,'unresolved':sorted(unresolved)}
+
+def show(costs,verbose=False):
+    print '%-40s %8s %10s %11s'%('file','headers','lines','unresolved')
+    for fname in sorted(costs.keys()):
+        cost = costs[fname]
+        print '%-40s %8d %10d %11d'%(fname,cost['headers'],cost['lines'],len(cost['unresolved']))
+        if verbose:
+            for name in cost['unresolved']:
+                print '    unresolved: %s'%name
+    print '%-40s %8d %10d'%('total',sum(c['headers'] for c in costs.values()),sum(c['lines'] for c in costs.values()))
+
+if __name__ == "__main__":
+    parser = OptionParser( usage = "usage: %prog [options] file [...]" )
+    parser.add_option('-I','--include', action='append',default=[],help='Include directory, in the order the compiler searches them (repeat as needed)')
+    parser.add_option('-v','--verbose', action='store_true',help='List the unresolved includes')
+    parser.add_option('--json', action='store',help='Also write the costs per file to this file')
+    (options, args) = parser.parse_args()
+    if len(args)==0:
+        parser.print_usage()
+        sys.exit(1)
+
+    graph = IncludeGraph(options.include)
+    costs = dict((fname,graph.cost(fname)) for fname in args)
+    show(costs,options.verbose)
+    if not options.json==None:
+        f_out = open(options.json,'w')
+        f_out.write(json.dumps(costs,indent=1,sort_keys=True)+'\n')
+        f_out.close()
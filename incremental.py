@@ -0,0 +1,187 @@
+#!/usr/bin/python
+# What:  incremental (re)generation that only touches files whose content changed
+#
+# Every directory with generated files gets a .lhcbskeleton.json recording, per file, the md5
+# of what was written together with the spec, author, date and package it was rendered with.
+# Re-rendering with the recorded values gives the same text unless a skeleton changed, and then:
+#   written    new file, or a generated file whose skeleton changed (temp file + rename)
+#   unchanged  re-rendered text identical to the file, not touched (mtime kept)
+#   modified   the file was edited since it was generated, kept as it is
+#   unmanaged  existing file that was not generated by us and differs, kept as it is
+#   missing    recorded file that was deleted since, not recreated by refresh()
+
+import sys,os,json,hashlib,tempfile,threading
+from optparse import Values
+from variants import render, specFields
+from support import doxyComment,generationContext
+import profiling
+
+manifestName = '.lhcbskeleton.json'
+statuses = ['written','unchanged','modified','unmanaged','missing']
+
+umask = os.umask(0)
+os.umask(umask)
+
+def md5(text):
+    return hashlib.md5(text).hexdigest()
+
+def fromJson(obj):
+    #json gives unicode, the rest of the generator works with (utf-8) str
+    if isinstance(obj,dict):
+        return dict((fromJson(k),fromJson(v)) for k,v in obj.items())
+    if isinstance(obj,unicode):
+        return obj.encode('utf-8')
+    return obj
+
+def atomicWrite(path,text,mode=None):
+    #write next to path and rename over it, so readers never see a partial file
+    with profiling.stage('write',file=path):
+        profiling.count('open')
+        dirname = os.path.dirname(path)
+        fd,tmp = tempfile.mkstemp(dir=dirname if not dirname=='' else '.',prefix='.'+os.path.basename(path)+'.')
+        try:
+            os.write(fd,text)
+            os.close(fd)
+            os.chmod(tmp,mode if not mode==None else 0666 & ~umask)
+            os.rename(tmp,path)
+        except:
+            os.unlink(tmp)
+            raise
+
+class Manifest:
+    def __init__(self,dirname):
+        self.path = os.path.join(dirname,manifestName)
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.dirty = False
+        if os.path.isfile(self.path):
+            f_in = open(self.path,'r')
+            self.entries = fromJson(json.loads(f_in.read()))
+            f_in.close()
+
+    def get(self,fname):
+        with self.lock:
+            return self.entries.get(fname)
+
+    def set(self,fname,entry):
+        with self.lock:
+            self.entries[fname] = entry
+            self.dirty = True
+
+    def save(self):
+        with self.lock:
+            if self.dirty:
+                atomicWrite(self.path,json.dumps(self.entries,indent=1,sort_keys=True)+'\n')
+                self.dirty = False
+
+manifests = {}
+manifestsLock = threading.Lock()
+def getManifest(dirname):
+    dirname = os.path.abspath(dirname)
+    with manifestsLock:
+        if not dirname in manifests:
+            manifests[dirname] = Manifest(dirname)
+        return manifests[dirname]
+
+def saveManifests():
+    with manifestsLock:
+        for manifest in manifests.values():
+            manifest.save()
+
+def newEntry(options):
+    generation = generationContext()
+    return {'spec':dict((field,getattr(options,field,None)) for field in specFields),
+            'author':generation.author,
+            'date':generation.date,
+            'package':generation.package}
+
+def context(cls,entry):
+    return {'comment':doxyComment(first=True, text = cls, author = entry['author'],
+                                  date = entry['date'], package = entry['package']),
+            'date':entry['date'],'author':entry['author']}
+
+#files generated next to a class: kind -> suffix after the class name
+companions = {'bench':'Bench.cpp','cmake':'Bench.cmake','options':'Options.py'}
+
+def renderFile(options,cls,kind,ctx):
+    #text of one generated file, kind is the file extension or one of companions
+    if kind=='cmake':
+        from LHCbBench import benchStanza
+        return benchStanza(cls)
+    if kind=='options':
+        from LHCbOptions import hiveOptions
+        return hiveOptions([(cls,options)],options.threads,options.slots)
+    return render(options,cls,kind,ctx)
+
+def updateFile(path,options,entry=None,kind=None):
+    #render path (name.h, name.cpp or a companion of the class) and write it only if that changes its content
+    cls,ext = os.path.splitext(os.path.basename(path))
+    kind = kind if not kind==None else ext[1:]
+    if kind in companions:
+        cls = os.path.basename(path)[:-len(companions[kind])]
+    manifest = getManifest(os.path.dirname(path) if not os.path.dirname(path)=='' else '.')
+    fname = os.path.basename(path)
+    old = manifest.get(fname)
+    if entry==None:
+        entry = old if not old==None else newEntry(options)
+        entry = dict(entry,spec=dict((field,getattr(options,field,None)) for field in specFields))
+    if kind in companions:
+        entry['kind'] = kind
+    text = renderFile(options,cls,kind,context(cls,entry))
+    entry['hash'] = md5(text)
+    if not os.path.isfile(path):
+        atomicWrite(path,text)
+        manifest.set(fname,entry)
+        return 'written'
+    profiling.count('open')
+    f_in = open(path,'r')
+    current = md5(f_in.read())
+    f_in.close()
+    if current==entry['hash']:
+        if old==None or not old.get('hash')==current:
+            manifest.set(fname,entry)
+        return 'unchanged'
+    if old==None:
+        return 'unmanaged'
+    if not current==old['hash']:
+        return 'modified'
+    atomicWrite(path,text,os.stat(path).st_mode & 07777)
+    manifest.set(fname,entry)
+    return 'written'
+
+def update(options,name):
+    #incremental version of generate(), returns [(filename, status)]
+    ret = []
+    if options.Header==True:
+        ret.append((name+'.h',updateFile(name+'.h',options)))
+    if options.cpp==True and not options.type=='I':
+        ret.append((name+'.cpp',updateFile(name+'.cpp',options)))
+    if options.bench==True and options.cpp==True:
+        for kind in ['bench','cmake']:
+            ret.append((name+companions[kind],updateFile(name+companions[kind],options,kind=kind)))
+    if options.hiveOptions==True:
+        ret.append((name+companions['options'],updateFile(name+companions['options'],options,kind='options')))
+    return ret
+
+def refresh(top):
+    #re-render every file recorded under top with its recorded spec, returns [(filename, status)]
+    ret = []
+    for dirpath,dirnames,filenames in os.walk(top):
+        if not manifestName in filenames: continue
+        manifest = getManifest(dirpath)
+        for fname,entry in sorted(manifest.entries.items()):
+            if not os.path.isfile(os.path.join(dirpath,fname)):
+                ret.append((os.path.join(dirpath,fname),'missing'))
+                continue
+            options = Values(dict((field,entry['spec'].get(field)) for field in specFields))
+            entry = dict(entry,spec=entry['spec'])
+            ret.append((os.path.join(dirpath,fname),updateFile(os.path.join(dirpath,fname),options,entry,entry.get('kind'))))
+    return ret
+
+def report(results):
+    counts = dict((status,0) for status in statuses)
+    for fname,status in results:
+        counts[status] += 1
+        if status in ['modified','unmanaged','missing']:
+            print '%s: %s, not updated'%(fname,status)
+    print ', '.join('%d %s'%(counts[status],status) for status in statuses)
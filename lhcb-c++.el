@@ -227,7 +227,7 @@ is displayed"
 	       nil)
   
 )
-(if is-gaudi-functional (let ((alg-type (upcase (read-string "Transformer, Producer, Consumer, MultiTransformer [T]/P/C/M : "))))
+(if is-gaudi-functional (let ((alg-type (upcase (read-string "Transformer, Producer, Consumer, MultiTransformer, SplittingTransformer, MergingTransformer, FilterPredicate, MultiTransformerFilter [T]/P/C/M/S/MG/F/MF : "))))
 			  (setq gfa-type alg-type )
 			  (setq is-plain-gfa (string= "" alg-type))
 			  (if (string= "" alg-type) (setq gfa-type "T"))
@@ -252,7 +252,11 @@ is displayed"
 
 
 (shell-command-to-string 
-(concat (getenv "EMACSDIR") "/MakeLHCbCppClass.py " 
+;; MakeLHCbCppClient.py talks to a running MakeLHCbCppServer.py and falls back to
+;; generating in process, so prefer it when it is installed
+(concat (getenv "EMACSDIR")
+	(if (file-executable-p (concat (getenv "EMACSDIR") "/MakeLHCbCppClient.py"))
+	    "/MakeLHCbCppClient.py " "/MakeLHCbCppClass.py ")
 	" -t " file-type " "
 	(if is-algorithm (concat "-a " atype " "))
 	(if is-DValg (concat "-d " atype " "))
@@ -0,0 +1,228 @@
+#!/usr/bin/python
+# What:  migrate legacy GaudiAlgorithm/DaVinci algorithms (.h/.cpp pairs) to Gaudi Functional
+#
+# Every header with a .cpp next to it is read. If its class derives from a Gaudi or DaVinci
+# algorithm base and has execute(), the get<>/getIfExists<> and put calls of the .cpp give the
+# typed inputs and outputs. Those, and whether the filter decision is computed, select the
+# functional shape (Producer, Consumer, Transformer, MultiTransformer, FilterPredicate,
+# MultiTransformerFilter). The new class is rendered through the raw_GaudiFunctional skeletons
+# with the original locations, author and date; a Histo/Tuple/DaVinci base is kept through
+# Traits::BaseClass_t. The execute() body itself has to be moved by hand. Files are analysed by
+# a process pool; the summary lists what was converted and why the rest was not.
+#   migrate.py -o functional Phys/MyPackage/src   (originals are never modified)
+#   migrate.py -n Phys/MyPackage/src              (only the summary)
+
+import sys,os,re,time
+from multiprocessing import Pool, cpu_count
+from optparse import OptionParser, Values
+from classindex import skipDir
+from variants import render, specFields
+from support import doxyComment,generationContext
+
+comments = re.compile(r'//[^\n]*|/\*.*?\*/',re.S)
+classBase = re.compile(r'\bclass\s+(\w+)\s*(?:final\s*)?:\s*(?:virtual\s+)?public\s+([\w:]+)')
+legacyExecute = re.compile(r'\bStatusCode\s+execute\s*\(\s*\)')
+getCall = re.compile(r'\b(?:get|getIfExists)\s*<\s*([\w:<>, ]+?)\s*>\s*\(')
+putCall = re.compile(r'\bput\s*\(')
+filterCall = re.compile(r'\bsetFilterPassed\s*\(\s*(?!true\s*\))')
+plainBases = ['GaudiAlgorithm']
+kept = re.compile(r'^(GaudiHistoAlg|GaudiTupleAlg|DaVinci\w*Algorithm|DVAlgorithm)$')
+
+def findPairs(paths):
+    #returns [(root, header, source)] for every header with a .cpp of the same name
+    pairs = []
+    for path in paths:
+        if os.path.isfile(path):
+            header = os.path.splitext(path)[0]+'.h'
+            if os.path.isfile(header) and os.path.isfile(os.path.splitext(path)[0]+'.cpp'):
+                pairs.append((os.path.dirname(header),header,os.path.splitext(path)[0]+'.cpp'))
+            continue
+        for dirpath,dirnames,filenames in os.walk(path):
+            dirnames[:] = sorted(d for d in dirnames if not skipDir(d))
+            for fname in sorted(filenames):
+                stem,ext = os.path.splitext(fname)
+                if ext=='.h' and stem+'.cpp' in filenames:
+                    pairs.append((path,os.path.join(dirpath,fname),os.path.join(dirpath,stem+'.cpp')))
+    return pairs
+
+def callArgs(text,pos):
+    #top level arguments of the call whose '(' is just before pos
+    args,depth,start = [],1,pos
+    while depth>0 and pos<len(text):
+        char = text[pos]
+        if char in '([{':
+            depth += 1
+        elif char in ')]}':
+            depth -= 1
+        elif char==',' and depth==1:
+            args.append(text[start:pos].strip())
+            start = pos+1
+        pos += 1
+    args.append(text[start:pos-1].strip())
+    return args
+
+def resolveLocation(loc,text):
+    #returns the location as C++ (a literal or a constant), None if it is computed
+    if re.match(r'^"[^"]*"$',loc) or re.match(r'^(\w+::)+\w+$',loc):
+        return loc
+    if re.match(r'^\w+$',loc):
+        #a member set as property default or assigned a constant
+        for pattern in [r'declareProperty\s*\(\s*"\w+"\s*,\s*%s\s*=\s*("[^"]*"|(?:\w+::)+\w+)',
+                        r'\b%s\s*(?:=|\{|\()\s*("[^"]*"|(?:\w+::)+\w+)',
+                        r'\b%s\s*\{\s*this\s*,\s*"\w+"\s*,\s*("[^"]*"|(?:\w+::)+\w+)']:
+            match = re.search(pattern%re.escape(loc),text)
+            if match:
+                return match.group(1)
+    return None
+
+def outputType(var,text):
+    for pattern in [r'\b%s\s*=\s*new\s+([\w:<>]+)',r'([\w:<>]+)\s*\*\s*%s\s*[=;(]']:
+        match = re.search(pattern%re.escape(var),text)
+        if match and not match.group(1)=='auto':
+            return match.group(1)
+    return 'OUTPUT'
+
+def analyse(header,source):
+    #returns a dict describing the class, 'shape' is None when there is no functional equivalent
+    f_in = open(header,'r')
+    htext = f_in.read()
+    f_in.close()
+    f_in = open(source,'r')
+    stext = comments.sub('',f_in.read())
+    f_in.close()
+    info = {'header':header,'source':source,'notes':[],'shape':None,'inputs':[],'outputs':[]}
+    author = re.search(r'@author\s+(.+)',htext)
+    date = re.search(r'@date\s+(.+)',htext)
+    info['author'] = author.group(1).strip() if author else None
+    info['date'] = date.group(1).strip() if date else None
+    htext = comments.sub('',htext)
+    match = classBase.search(htext)
+    if not match or not (match.group(2) in plainBases or kept.match(match.group(2))):
+        return info
+    info['name'],info['base'] = match.groups()
+    if not legacyExecute.search(htext):
+        info['reason'] = 'no execute() to convert'
+        return info
+    for call in getCall.finditer(stext):
+        loc = callArgs(stext,call.end())[-1]
+        info['inputs'].append((call.group(1).strip(),loc,resolveLocation(loc,stext)))
+    for call in putCall.finditer(stext):
+        args = callArgs(stext,call.end())
+        if len(args)<2: continue
+        info['outputs'].append((outputType(args[-2],stext),args[-1],resolveLocation(args[-1],stext)))
+    #the same location read (or written) twice is one input (output)
+    for kind in ['inputs','outputs']:
+        seen = []
+        info[kind] = [io for io in info[kind] if not (io[1] in seen or seen.append(io[1]))]
+    isFilter = filterCall.search(stext) is not None
+    nin,nout = len(info['inputs']),len(info['outputs'])
+    if nin==0 and nout==0:
+        info['reason'] = 'no event data access (get<>/put) found'
+    elif nin==0 and (isFilter or nout>1):
+        info['reason'] = 'no inputs but %s'%('a filter decision' if isFilter else '%d outputs'%nout)
+    elif isFilter:
+        info['shape'] = 'FilterPredicate' if nout==0 else 'MultiTransformerFilter'
+    elif nin==0:
+        info['shape'] = 'Producer'
+    elif nout==0:
+        info['shape'] = 'Consumer'
+    else:
+        info['shape'] = 'Transformer' if nout==1 else 'MultiTransformer'
+    for kind,ios in [('input',info['inputs']),('output',info['outputs'])]:
+        for ctype,loc,cpploc in ios:
+            if cpploc==None:
+                info['notes'].append('%s location %s is computed, set it by hand'%(kind,loc))
+    return info
+
+def functionalOptions(info):
+    #the command line options of the proposed class, as parse_type would leave them
+    options = Values(dict((field,None) for field in specFields))
+    options.type = 'GFA'
+    options.GaudiFunctional = info['shape']
+    intypes = ['const '+ctype for ctype,loc,cpploc in info['inputs']]
+    outtypes = [ctype for ctype,loc,cpploc in info['outputs']]
+    options.GaudiFunctionalInput = '&, '.join(intypes)
+    if info['shape'] in ['Consumer','FilterPredicate']:
+        options.GaudiFunctionalOutput = 'void' if info['shape']=='Consumer' else 'bool'
+    elif info['shape'] in ['MultiTransformer','MultiTransformerFilter']:
+        options.GaudiFunctionalOutput = 'std::tuple<%s>'%','.join(outtypes)
+    else:
+        options.GaudiFunctionalOutput = outtypes[0]
+    location = lambda io: io[2] if not io[2]==None else '"UNRESOLVED"'
+    if len(info['inputs'])>0:
+        options.GaudiFunctionalInputLocations = ','.join(location(io) for io in info['inputs'])
+    if len(info['outputs'])>0:
+        options.GaudiFunctionalOutputLocations = ','.join(location(io) for io in info['outputs'])
+    if not info['base'] in plainBases:
+        options.GFInheritance = ', Gaudi::Functional::Traits::BaseClass_t<%s>'%info['base']
+    return options
+
+def migrateOne(job):
+    #analyse one pair and render its functional version, returns (info, [(path, text)])
+    root,header,source,outdir = job
+    info = analyse(header,source)
+    if info['shape']==None:
+        return info,[]
+    options = functionalOptions(info)
+    name = info['name']
+    generation = generationContext()
+    author = info['author'] if not info['author']==None else generation.author
+    date = info['date'] if not info['date']==None else generation.date
+    package = os.path.basename(os.path.dirname(os.path.abspath(header)))
+    target = os.path.join(outdir,os.path.relpath(os.path.dirname(header),root))
+    files = [(os.path.normpath(os.path.join(target,name+'.h')),
+              render(options,name,'h',{'comment':doxyComment(first=True, text = name, author = author, date = date, package = package)})),
+             (os.path.normpath(os.path.join(target,name+'.cpp')),
+              render(options,name,'cpp',{'date':date,'author':author}))]
+    return info,files
+
+def summary(results):
+    converted = [info for info,files in results if not info['shape']==None]
+    failed = [info for info,files in results if info['shape']==None and 'reason' in info]
+    for info,files in results:
+        if not 'name' in info: continue
+        io = '%d in, %d out'%(len(info['inputs']),len(info['outputs']))
+        if info['shape']==None:
+            print '%-30s %-24s %-16s %s'%(info['name'],'NOT CONVERTED',info['base'],info['reason'])
+        else:
+            print '%-30s %-24s %-16s %s'%(info['name'],info['shape'],info['base'],io)
+        for note in info['notes']:
+            print '    %s'%note
+    print '%d algorithms converted, %d not convertible, %d other classes skipped'%(len(converted),len(failed),
+                                                                                  len(results)-len(converted)-len(failed))
+
+if __name__ == "__main__":
+    parser = OptionParser( usage = "usage: %prog [options] directory|file [...]" )
+    parser.add_option('-o','--output', action='store',default='functional',help='Directory the functional versions are written to, mirroring the sources (default %default)')
+    parser.add_option('-n','--dry-run', action='store_true',help='Only print the summary')
+    parser.add_option('-f','--force', action='store_true',help='Overwrite existing files in the output directory')
+    parser.add_option('-j','--jobs', action='store',type='int',help='Number of processes (default: number of cpus)')
+    (options, args) = parser.parse_args()
+    if len(args)==0:
+        parser.print_usage()
+        sys.exit(1)
+
+    start = time.time()
+    jobs = [(root,header,source,options.output) for root,header,source in findPairs(args)]
+    pool = Pool(options.jobs if options.jobs else cpu_count())
+    try:
+        results = pool.map(migrateOne,jobs,chunksize=max(1,len(jobs)/(4*(options.jobs or cpu_count()))))
+    finally:
+        pool.close()
+        pool.join()
+    summary(results)
+    written = skipped = 0
+    if not options.dry_run:
+        for info,files in results:
+            for path,text in files:
+                if os.path.exists(path) and not options.force:
+                    skipped += 1
+                    continue
+                if not os.path.isdir(os.path.dirname(path)):
+                    os.makedirs(os.path.dirname(path))
+                f_out = open(path,'w')
+                f_out.write(text)
+                f_out.close()
+                written += 1
+        print '%d files written to %s (%d existing files skipped)'%(written,options.output,skipped)
+    print '%d header/source pairs in %.2f s'%(len(jobs),time.time()-start)
@@ -0,0 +1,150 @@
+#!/usr/bin/python
+# What:  opt-in timing of the generation stages, written as a Chrome trace
+#
+# Enabled with MakeLHCbCppClass.py --profile FILE or $LHCBSKELETON_PROFILE=FILE. Records wall
+# time per stage (start-up, imports, option parsing, and per class: type parsing, author
+# lookup, skeleton reads, pre-rendering, substitution, writes) and counts file opens, stats and
+# user database lookups. FILE can be loaded in chrome://tracing or ui.perfetto.dev; the totals
+# per stage and the counters are also in its "otherData".
+# Each main() call is one session: enable() starts it with no events, and main() writes the trace
+# to that call's FILE when it returns, so every request to MakeLHCbCppServer.py gets its own.
+# When disabled stage() returns a shared do-nothing object and count() returns immediately, and
+# nothing but os, time and thread is imported.
+
+import os,time,thread
+
+enabled = False
+session = None
+events = []
+counters = {}
+lock = thread.allocate_lock()
+
+def processStart():
+    #when this process started (linux only, to the clock tick), None if unknown
+    try:
+        f_in = open('/proc/self/stat','r')
+        starttime = float(f_in.read().rsplit(')',1)[1].split()[19])/os.sysconf('SC_CLK_TCK')
+        f_in.close()
+        f_in = open('/proc/uptime','r')
+        uptime = float(f_in.read().split()[0])
+        f_in.close()
+        return time.time()-(uptime-starttime)
+    except (IOError,OSError,IndexError,ValueError):
+        return None
+
+#start-up is timed by marks, cheap enough to always take, turned into stages on enable()
+#and dropped by finish(), later calls of main() in the same process have no start-up
+marks = [('interpreter start-up',None),('profiling',time.time())]
+def mark(name):
+    if len(marks)==0:
+        return
+    now = time.time()
+    if enabled:
+        record(name,marks[-1][1],now)
+    marks.append((name,now))
+
+def record(name,start,end,args=None):
+    event = {'name':name,'ph':'X','ts':start*1e6,'dur':(end-start)*1e6,
+             'pid':os.getpid(),'tid':thread.get_ident() % 100000}
+    if args:
+        event['args'] = args
+    with lock:
+        events.append(event)
+
+class Stage:
+    def __init__(self,name,args):
+        self.name = name
+        self.args = args
+    def __enter__(self):
+        self.start = time.time()
+        return self
+    def __exit__(self,*exc):
+        record(self.name,self.start,time.time(),self.args)
+        return False
+
+class NoStage:
+    def __enter__(self):
+        return self
+    def __exit__(self,*exc):
+        return False
+noStage = NoStage()
+
+def stage(name,**args):
+    if not enabled:
+        return noStage
+    return Stage(name,args)
+
+def count(name):
+    if not enabled:
+        return
+    with lock:
+        counters[name] = counters.get(name,0)+1
+
+class Session:
+    #what is recorded from enable() until write(), written to path
+    def __init__(self,path):
+        global enabled
+        self.path = path
+        with lock:
+            del events[:]
+            counters.clear()
+        enabled = True
+        if len(marks)==0:
+            return
+        start = processStart()
+        if start==None:
+            start = marks[1][1]
+        for name,end in marks[1:]:
+            if name=='profiling':
+                name = marks[0][0]
+            record(name,start,end)
+            start = end
+
+    def write(self):
+        global enabled,session
+        try:
+            write(self.path)
+        finally:
+            enabled = False
+            session = None
+            with lock:
+                del events[:]
+                counters.clear()
+
+def enable(path):
+    #start a session writing to path, or continue the one $LHCBSKELETON_PROFILE started for it
+    global session
+    if not session==None and session.path==path:
+        return session
+    session = Session(path)
+    return session
+
+def finish(current):
+    #end of a main() call: the start-up is over and current (if not None) writes its trace
+    del marks[:]
+    if not current==None:
+        current.write()
+
+def write(path):
+    import json
+    totals = {}
+    with lock:
+        for event in events:
+            totals[event['name']] = totals.get(event['name'],0)+event['dur']/1e3
+        trace = {'traceEvents':events+[{'name':'operations','ph':'C','ts':time.time()*1e6,
+                                        'pid':os.getpid(),'args':dict(counters)}],
+                 'displayTimeUnit':'ms',
+                 'otherData':{'counters':dict(counters),'totals_ms':totals}}
+    f_out = open(path,'w')
+    f_out.write(json.dumps(trace,indent=1,sort_keys=True)+'\n')
+    f_out.close()
+
+def writeAtExit():
+    #a session main() did not end, e.g. when only the api is used
+    if not session==None:
+        session.write()
+
+if os.environ.get('LHCBSKELETON_PROFILE'):
+    import atexit
+    enable(os.environ['LHCBSKELETON_PROFILE'])
+    atexit.register(writeAtExit)
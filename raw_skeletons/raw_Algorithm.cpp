@@ -1,11 +1,8 @@
-//Include files
-
-// from Gaudi
-#include "GaudiKernel/AlgFactory.h" 
+${pchInclude}//Include files
 
 //local
 
-#include "${name}.h"
+#include "${name}.h"${toolIncludes}${timingTimer}
 
 //-----------------------------------------------------------------------------
 // Implementation file for class : ${name}
@@ -14,7 +11,7 @@
 //-----------------------------------------------------------------------------
 
 // Declaration of the factory
-DECLARE_ALGORITHM_FACTORY( ${name} )
+DECLARE_COMPONENT( ${name} )
 
 //===========================================================================
 // Standard constructor, initializes variables
@@ -48,7 +45,7 @@ StatusCode ${name}::initialize() {
 //===========================================================================
 // Main execution
 //===========================================================================
-StatusCode ${name}::execute() {
+StatusCode ${name}::execute() {${timingScope}
 
   if ( msgLevel(MSG::DEBUG) ) debug() << "==> Execute" << endmsg;
   return StatusCode::SUCCESS;
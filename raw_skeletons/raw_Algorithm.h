@@ -2,9 +2,9 @@
 
 // Include Files
 
-#include "GaudiAlg/Gaudi${AlgorithmTypeName}.h"
+#include "GaudiAlg/Gaudi${AlgorithmTypeName}.h"${timingInclude}
 
-${comment}
+${forwardDecls}${comment}
 
 
 class ${name} : public Gaudi${AlgorithmTypeName} {
@@ -20,6 +20,6 @@ class ${name} : public Gaudi${AlgorithmTypeName} {
 
  protected:
   
- private:
+ private:${timingMember}
 
 };
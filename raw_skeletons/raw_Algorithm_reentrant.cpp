@@ -0,0 +1,62 @@
+${pchInclude}//Include files
+
+//local
+
+#include "${name}.h"${toolIncludes}${timingTimer}
+
+//-----------------------------------------------------------------------------
+// Implementation file for class : ${name}
+//
+// ${date} : ${author}
+//-----------------------------------------------------------------------------
+
+// Declaration of the factory
+DECLARE_COMPONENT( ${name} )
+
+//===========================================================================
+// Standard constructor, initializes variables
+//===========================================================================
+${name}::${name}( const std::string& name,
+                        ISvcLocator* pSvcLocator )
+: Gaudi::Algorithm ( name , pSvcLocator )
+{
+
+
+}
+
+//===========================================================================
+// Initialization
+//===========================================================================
+StatusCode ${name}::initialize() {
+  StatusCode sc = Gaudi::Algorithm::initialize(); // must be executed first
+  if ( sc.isFailure() ) return sc;  // error printed already by Gaudi::Algorithm
+  
+  if ( msgLevel(MSG::DEBUG) ) debug() << "==> Initialize" << endmsg;
+  
+  return StatusCode::SUCCESS; 
+}
+
+//===========================================================================
+// Main execution, called concurrently for several events
+//===========================================================================
+StatusCode ${name}::execute( const EventContext& ) const {${timingScope}
+
+  if ( msgLevel(MSG::DEBUG) ) debug() << "==> Execute" << endmsg;
+  const INPUT* input = m_input.get();
+  auto output = std::make_unique<OUTPUT>();
+  // fill *output from *input
+  m_output.put( std::move( output ) );
+  ++m_events;
+  return StatusCode::SUCCESS;
+}
+//===========================================================================
+// Finalize
+//===========================================================================
+StatusCode ${name}::finalize() {
+
+	if ( msgLevel(MSG::DEBUG) ) debug() << "==> Finalize" << endmsg;
+
+	return Gaudi::Algorithm::finalize();
+}
+
+//===========================================================================
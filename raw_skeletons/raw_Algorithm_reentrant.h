@@ -0,0 +1,29 @@
+#pragma once 
+
+// Include Files
+
+#include "GaudiKernel/Algorithm.h"
+#include "GaudiKernel/DataObjectHandle.h"
+#include "Gaudi/Accumulators.h"
+
+${forwardDecls}${comment}
+
+
+class ${name} : public Gaudi::Algorithm {
+ public: 
+  /// Standard constructor
+  ${name} ( const std::string& name, ISvcLocator* pSvcLocator ) ;
+
+  StatusCode initialize() override;                              ///< Algorithm initialization
+  StatusCode execute   ( const EventContext& ) const override;  ///< Algorithm execution, reentrant
+  StatusCode finalize  () override;                              ///< Algorithm finalization
+
+ private:
+  /// event data, declared to the scheduler through the handles
+  DataObjectReadHandle<INPUT>   m_input { this, "InputLocation",  "INPUTLOCATION"  };
+  DataObjectWriteHandle<OUTPUT> m_output{ this, "OutputLocation", "OUTPUTLOCATION" };
+
+  /// per event statistics. execute() runs concurrently: no other member may change in it
+  mutable Gaudi::Accumulators::Counter<> m_events{ this, "Events" };${timingMember}
+
+};
@@ -1,10 +1,7 @@
-// Include files
-
-// from Gaudi
-#include "GaudiKernel/AlgFactory.h"
+${pchInclude}// Include files
 
 // local
-#include "${name}.h"
+#include "${name}.h"${toolIncludes}${timingTimer}
 
 
 
@@ -16,7 +13,7 @@
 
 // Declaration of the Algorithm Factory
 
-DECLARE_ALGORITHM_FACTORY( ${name} )
+DECLARE_COMPONENT( ${name} )
 
 //=============================================================================
 // Standard constructor, initializes variables
@@ -49,7 +46,7 @@ StatusCode ${name}::initialize() {
 //=============================================================================
 // Main execution
 //=============================================================================
-StatusCode ${name}::execute() {
+StatusCode ${name}::execute() {${timingScope}
   if ( msgLevel(MSG::DEBUG) ) debug() << "==> Execute" << endmsg;
 
   setFilterPassed(true);  // Mandatory. Set to true if event is accepted.
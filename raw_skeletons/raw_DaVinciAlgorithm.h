@@ -1,9 +1,9 @@
 #pragma once
 
 // Include Files
-#include "Kernel/DaVinci${DaVinciAlgorithmTypeName}Algorithm"
+#include "Kernel/DaVinci${DaVinciAlgorithmTypeName}Algorithm"${timingInclude}
 
-${comment}
+${forwardDecls}${comment}
 
 class ${name} : public DaVinci${DaVinciAlgorithmTypeName}Algorithm {
  public:
@@ -17,6 +17,6 @@ class ${name} : public DaVinci${DaVinciAlgorithmTypeName}Algorithm {
 
  protected:
 
- private:
+ private:${timingMember}
 
 };
@@ -0,0 +1,68 @@
+${pchInclude}// Include files
+
+// local
+#include "${name}.h"${toolIncludes}${timingTimer}
+
+
+
+//----------------------------------------------------------------------------- 
+// Implementation file for class : ${name}
+//
+// ${date} : ${author}
+//----------------------------------------------------------------------------- 
+
+// Declaration of the Algorithm Factory
+
+DECLARE_COMPONENT( ${name} )
+
+//=============================================================================
+// Standard constructor, initializes variables
+//=============================================================================
+
+${name}::${name} ( const std::string& name, 
+		   ISvcLocator* pSvcLocator)
+:Gaudi::Algorithm ( name,  pSvcLocator )
+{
+
+}
+
+//=============================================================================
+// Initialization
+//=============================================================================
+StatusCode ${name}::initialize() {
+  StatusCode sc = Gaudi::Algorithm::initialize(); // must be executed first
+  if ( sc.isFailure() ) return sc;  // error printed already by Gaudi::Algorithm
+
+  if ( msgLevel(MSG::DEBUG) ) debug() << "==> Initialize" << endmsg;
+
+  return StatusCode::SUCCESS;
+}
+
+//=============================================================================
+// Main execution, called concurrently for several events
+//=============================================================================
+StatusCode ${name}::execute( const EventContext& ctx ) const {${timingScope}
+  if ( msgLevel(MSG::DEBUG) ) debug() << "==> Execute" << endmsg;
+
+  auto selected = std::make_unique<LHCb::Particle::Selection>();
+  for ( const LHCb::Particle* p : m_particles.get() ) {
+    selected->insert( p );  // apply the selection to p
+  }
+  m_nSelected += selected->size();
+  ++m_events;
+  execState( ctx ).setFilterPassed( !selected->empty() );  // Mandatory. Set to true if event is accepted.
+  m_selected.put( std::move( selected ) );
+  return StatusCode::SUCCESS;
+}
+
+//=============================================================================
+//  Finalize
+//=============================================================================
+StatusCode ${name}::finalize() {
+
+  if ( msgLevel(MSG::DEBUG) ) debug() << "==> Finalize" << endmsg;
+
+  return Gaudi::Algorithm::finalize();  // must be called after all other actions
+}
+
+//=============================================================================
@@ -0,0 +1,29 @@
+#pragma once
+
+// Include Files
+#include "GaudiKernel/Algorithm.h"
+#include "GaudiKernel/DataObjectHandle.h"
+#include "Gaudi/Accumulators.h"
+#include "Event/Particle.h"
+
+${forwardDecls}${comment}
+
+class ${name} : public Gaudi::Algorithm {
+ public:
+  /// Standard constructor 
+  ${name} ( const std::string& name, ISvcLocator* pSvcLocator );
+
+  StatusCode initialize() override ;                              ///< Algorithm initialization
+  StatusCode execute   ( const EventContext& ) const override ;  ///< Algorithm execution, reentrant
+  StatusCode finalize  () override ;                              ///< Algorithm finalization
+
+ private:
+  /// particles in and out, declared to the scheduler through the handles
+  DataObjectReadHandle<LHCb::Particle::Range>      m_particles{ this, "Inputs", "INPUTLOCATION" };
+  DataObjectWriteHandle<LHCb::Particle::Selection> m_selected { this, "Output", "OUTPUTLOCATION" };
+
+  /// per event statistics. execute() runs concurrently: no other member may change in it
+  mutable Gaudi::Accumulators::Counter<>        m_events   { this, "Events" };
+  mutable Gaudi::Accumulators::StatCounter<int> m_nSelected{ this, "Selected particles" };${timingMember}
+
+};
@@ -1,7 +1,7 @@
-//Include files 
+${pchInclude}//Include files 
 
 //local
-#include "${name}.h"
+#include "${name}.h"${toolIncludes}${timingTimer}
 
 //--------------------------------------------------------------------------- 
 // Implementation file for class : ${name}
@@ -14,6 +14,6 @@ DECLARE_COMPONENT( ${name} )
 //===========================================================================
 // operator () implementation
 //===========================================================================
-${GaudiFunctionalOutput} ${name}::operator()(${GaudiFunctionalInput}${ref}) const {
+${GaudiFunctionalReturn} ${name}::operator()(${GaudiFunctionalInput}${ref}) const {${timingScope}
   ${operatorParenText}
 }
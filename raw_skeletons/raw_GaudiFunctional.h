@@ -1,9 +1,9 @@
 #pragma once
 
 //From Gaudi
-#include "GaudiAlg/${GaudiFunctional}.h"
+#include "GaudiAlg/${GaudiFunctionalHeader}.h"${timingInclude}
 
-${comment}
+${soaStructs}${forwardDecls}${comment}
 
 class ${name}: public Gaudi::Functional::${GaudiFunctional}<${GaudiFunctionalOutput} (${GaudiFunctionalInput}${ref} )${GFInheritance}>{
  public:
@@ -13,10 +13,10 @@ class ${name}: public Gaudi::Functional::${GaudiFunctional}<${GaudiFunctionalOut
                            ${funcIO} )
 				 {}
 
-  ${GaudiFunctionalOutput} operator()(${GaudiFunctionalInput}) const override;
+  ${GaudiFunctionalReturn} operator()(${GaudiFunctionalInput}) const override;
 
  protected:
 
- private:
+ private:${timingMember}
 
 };
@@ -0,0 +1,83 @@
+//Include files
+
+//local
+#include "${name}.h"
+
+#include "GaudiKernel/Bootstrap.h"
+#include "GaudiKernel/IAppMgrUI.h"
+#include "GaudiKernel/IProperty.h"
+#include "GaudiKernel/SmartIF.h"
+
+#include <chrono>
+#include <cstdio>
+#include <sstream>
+#include <string>
+#include <thread>
+#include <vector>
+
+//---------------------------------------------------------------------------
+// Micro-benchmark for class : ${name}
+// operator() called directly, without the event loop:
+//   ${name}Bench [sizes] [threads] [calls]     e.g. ${name}Bench 10,100,1000 1,2,4 1000
+
+// ${date} : ${author}
+//---------------------------------------------------------------------------
+
+namespace {
+  /// synthetic input of n entries: fill it the way the real producer would
+  template <typename T>
+  T synthetic( std::size_t n ) {
+    T data;
+    (void)n;
+    return data;
+  }
+
+  /// keeps the compiler from optimising the call away
+  inline void escape( const void* p ) { asm volatile( "" : : "g"( p ) : "memory" ); }
+
+  std::vector<unsigned long> parseList( const char* arg ) {
+    std::vector<unsigned long> ret;
+    std::stringstream list( arg );
+    std::string item;
+    while ( std::getline( list, item, ',' ) ) ret.push_back( std::stoul( item ) );
+    return ret;
+  }
+}
+
+int main( int argc, char** argv ) {
+  const auto sizes   = parseList( argc > 1 ? argv[1] : "10,100,1000,10000" );
+  const auto threads = parseList( argc > 2 ? argv[2] : "1,2,4" );
+  const auto calls   = std::stoul( argc > 3 ? argv[3] : "1000" );
+
+  // a minimal framework, configured but not running any event
+  SmartIF<IAppMgrUI> app = Gaudi::createApplicationMgr();
+  SmartIF<IProperty> appProps( app );
+  appProps->setProperty( "JobOptionsType", "'NONE'" ).ignore();
+  appProps->setProperty( "OutputLevel", "4" ).ignore();
+  if ( app->configure().isFailure() || app->initialize().isFailure() ) return 1;
+
+  // initialize() is not called: set up here whatever operator() needs
+  const ${name} alg( "${name}", Gaudi::svcLocator() );
+
+  std::printf( "%10s %8s %14s %16s\n", "size", "threads", "ns per call", "calls per s" );
+  for ( const auto size : sizes ) {
+    ${benchInputs}
+    for ( const auto nthreads : threads ) {
+      const auto start = std::chrono::steady_clock::now();
+      std::vector<std::thread> workers;
+      for ( unsigned long t = 0; t < nthreads; ++t ) {
+        workers.emplace_back( [&] {
+          for ( unsigned long i = 0; i < calls; ++i ) {
+            ${benchCall}
+          }
+        } );
+      }
+      for ( auto& worker : workers ) worker.join();
+      const double seconds = std::chrono::duration<double>( std::chrono::steady_clock::now() - start ).count();
+      std::printf( "%10lu %8lu %14.1f %16.0f\n", size, nthreads, 1e9 * seconds / calls, nthreads * calls / seconds );
+    }
+  }
+  app->finalize().ignore();
+  app->terminate().ignore();
+  return 0;
+}
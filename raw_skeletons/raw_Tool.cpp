@@ -1,8 +1,8 @@
-//Include files
+${pchInclude}//Include files
 
 //local
 
-#include "${name}.h"
+#include "${name}.h"${toolIncludes}
 //---------------------------------------------------------------------------
 // Implementation file for class : ${name}
 //
@@ -5,7 +5,7 @@
 #include "GaudiAlg/GaudiTool.h"
 ${ExtraInclude}
 
-${comment}
+${forwardDecls}${comment}
 
 class ${name} : public GaudiTool ${ExtraToolString} {
  public:
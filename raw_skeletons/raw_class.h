@@ -3,7 +3,7 @@
 // Include Files
 
 
-${comment}
+${forwardDecls}${comment}
 
 class ${name} {
 public:
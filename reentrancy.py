@@ -0,0 +1,111 @@
+#!/usr/bin/python
+# What:  static check that an algorithm class can run on several events at the same time
+#
+# Flags, in the class declared in a header, everything execute() could change from one event to
+# the next: data members that are neither const nor one of the thread-safe kinds below (also
+# when mutable or static), and execute()/operator() declared without const. Accepted are
+# Gaudi::Accumulators counters, data/tool/service handles and properties (only changed while
+# configuring). Meant for the --reentrant skeletons once they have been filled in:
+#   reentrancy.py MyAlg.h [...]   prints file:line: message, exit 1 if anything was found
+# It is a text scan, not a C++ parser: macros and members declared through typedefs of the
+# accepted kinds are not recognised.
+
+import sys,re
+
+threadSafe = re.compile(r'\b(Gaudi::Accumulators::\w+|DataObject(Read|Write)?Handle|\w*DataHandle|'
+                        r'Gaudi::Property|(Public|Private)?ToolHandle(Array)?|ServiceHandle|KeyValues?)\b')
+classHead = re.compile(r'\b(class|struct)\s+(\w+)[^;{]*\{')
+access = re.compile(r'(\s*(public|protected|private)\s*:)*\s*')
+comments = re.compile(r'//[^\n]*|/\*.*?\*/',re.S)
+skipped = re.compile(r'^\s*(using|typedef|friend|enum|class|struct|template|static_assert)\b')
+
+def blank(match):
+    #keep the line numbers of the text
+    return re.sub(r'[^\n]',' ',match.group(0))
+
+def declarations(body,offset):
+    #top level statements of a class body, as (offset, text) without the access specifiers
+    def statement(start,end):
+        lead = access.match(body,start).end()
+        return (offset+lead,body[lead:end])
+    ret = []
+    depth,parens,start,head = 0,0,0,''
+    for pos,char in enumerate(body):
+        if char in '()':
+            parens += 1 if char=='(' else -1
+        elif parens>0:
+            continue
+        elif char=='{':
+            if depth==0:
+                head = body[start:pos]
+            depth += 1
+        elif char=='}':
+            depth -= 1
+            #an inline function body ends the statement, a brace initialiser does not
+            if depth==0 and '(' in head and not '=' in re.sub(r'\([^()]*\)','',head):
+                ret.append(statement(start,pos+1))
+                start,head = pos+1,''
+        elif char==';' and depth==0:
+            ret.append(statement(start,pos))
+            start,head = pos+1,''
+    return ret
+
+def check(decl):
+    #what is wrong with one declaration, or None
+    decl = decl.strip()
+    if decl=='' or skipped.match(decl):
+        return None
+    head = re.split(r'[{=]',decl)[0]
+    if '(' in head:
+        #member function: only execute and operator() have to be const
+        name = re.search(r'(operator\s*\(\s*\)|~?\w+)\s*\(',head).group(1)
+        if name in ['execute'] or name.replace(' ','')=='operator()':
+            tail = head[head.rfind(')')+1:]
+            if not re.search(r'\bconst\b',tail):
+                return '%s is not const'%name.replace(' ','')
+        return None
+    words = head.split()
+    name = re.sub(r'\[.*','',words[-1]).lstrip('*&') if len(words)>0 else head
+    if threadSafe.search(head):
+        return None
+    if re.match(r'^(static\s+)?(constexpr|const)\b',head) or re.search(r'\bconstexpr\b',head):
+        return None
+    if re.search(r'\bstatic\b',head):
+        return 'static member %s is shared by all events'%name
+    if re.search(r'\bmutable\b',head):
+        return 'mutable member %s can change in execute()'%name
+    return 'non-const member %s can change in execute()'%name
+
+def findings(text):
+    #returns [(line, message)] for every class declared in text
+    text = comments.sub(blank,text)
+    ret = []
+    end = 0
+    for match in classHead.finditer(text):
+        if match.start()<end:
+            #nested type, its members are not members of the algorithm
+            continue
+        depth,end = 1,match.end()
+        while depth>0 and end<len(text):
+            depth += {'{':1,'}':-1}.get(text[end],0)
+            end += 1
+        for offset,decl in declarations(text[match.end():end-1],match.end()):
+            message = check(decl)
+            if not message==None:
+                line = text.count('\n',0,offset)+1
+                ret.append((line,'%s: %s'%(match.group(2),message)))
+    return ret
+
+if __name__ == "__main__":
+    if len(sys.argv)<2:
+        print 'usage: reentrancy.py HEADER [...]'
+        sys.exit(1)
+    found = 0
+    for path in sys.argv[1:]:
+        f_in = open(path,'r')
+        text = f_in.read()
+        f_in.close()
+        for line,message in findings(text):
+            print '%s:%d: %s'%(path,line,message)
+            found += 1
+    sys.exit(1 if found>0 else 0)
@@ -0,0 +1,165 @@
+#!/usr/bin/python
+# What:  generate a whole package: src/ classes, CMakeLists.txt and options running the algorithms
+#
+# The classes are listed in a manifest, as for MakeLHCbCppClass.py -m (see batch.py), e.g.
+#   scaffold.py Phys/MyAnalysis classes.json                  # into ./Phys/MyAnalysis
+#   scaffold.py -f tgz Phys/MyAnalysis classes.txt > pkg.tgz  # tar stream on stdout
+#   scaffold.py -f zip -o pkg.zip Phys/MyAnalysis classes.txt
+# The files are produced one at a time by scaffold() as (path, text) and written out as they
+# come, so memory does not grow with the package; a tar stream or zip file takes a single output
+# file for the whole package. The package name is used in the class comments instead of the
+# current directory, which makes the output the same wherever it is generated.
+
+import sys,os,time,tarfile,zipfile
+from optparse import OptionParser
+from cStringIO import StringIO
+from batch import read_manifest, validate
+from MakeLHCbCppClass import parse_type
+from variants import render
+from support import doxyComment,generationContext
+from LHCbBench import benchStanza
+from LHCbOptions import hiveOptions
+
+#class types run as algorithms, and the libraries they need (subdir, library)
+algorithmTypes = ['A','DVA','GFA']
+linkLibraries = {'DVA':('Phys/DaVinciKernel','DaVinciKernelLib')}
+baseLibrary = ('GaudiAlg','GaudiAlgLib')
+bufferSize = 1<<16
+
+def duplicates(specs):
+    #every class goes to src/<class>, so a class name can only be used once whatever its directory
+    errors = []
+    seen = {}
+    for num,(options,name) in enumerate(specs):
+        if not name: continue
+        cls = os.path.basename(name)
+        if cls in seen and not seen[cls][1]==name:
+            errors.append('entry %d (%s): src/%s also generated by entry %d (%s)'%(num+1,name,cls,seen[cls][0],seen[cls][1]))
+        seen.setdefault(cls,(num+1,name))
+    return errors
+
+def cmakeLists(package,specs):
+    pkg = os.path.basename(package)
+    libraries = [baseLibrary]+sorted(set(linkLibraries[o.type] for o,n in specs if o.type in linkLibraries))
+    sources = ['src/%s.cpp'%os.path.basename(n) for o,n in specs if o.cpp==True and not o.type=='I']
+    text = '#'*80+'\n# Package: %s\n'%pkg+'#'*80+'\n'
+    text+= 'gaudi_subdir(%s v1r0)\n\n'%pkg
+    text+= 'gaudi_depends_on_subdirs(%s)\n\n'%'\n                         '.join(sub for sub,lib in libraries)
+    text+= 'gaudi_add_module(%s\n                 %s\n'%(pkg,'\n                 '.join(sources))
+    text+= '                 INCLUDE_DIRS src\n'
+    text+= '                 LINK_LIBRARIES %s)\n'%' '.join(lib for sub,lib in libraries)
+    for options,name in specs:
+        if options.bench==True and options.cpp==True:
+            text+= '\n'+benchStanza(os.path.basename(name))
+    return text
+
+def optionsFile(package,specs):
+    pkg = os.path.basename(package)
+    algs = [os.path.basename(n) for o,n in specs if o.type in algorithmTypes]
+    text = '# Options running the algorithms of %s in one sequence\n'%pkg
+    text+= 'from Gaudi.Configuration import *\n'
+    if len(algs)==0:
+        return text
+    text+= 'from Configurables import GaudiSequencer, %s\n\n'%', '.join(algs)
+    text+= 'seq = GaudiSequencer("%sSeq")\n'%pkg
+    text+= 'seq.Members = [%s]\n'%(',\n               '.join('%s("%s")'%(alg,alg) for alg in algs))
+    text+= 'ApplicationMgr().TopAlg += [seq]\n'
+    return text
+
+def scaffold(package,specs,author=None,date=None):
+    #yields (path, text) for every file of the package, specs as validated by batch.validate
+    generation = generationContext()
+    author = author if not author==None else generation.author
+    date = date if not date==None else generation.date
+    pkg = os.path.basename(package)
+    for options,name in specs:
+        cls = os.path.basename(name)
+        if options.Header==True:
+            yield (package+'/src/'+cls+'.h',render(options,cls,'h',{'comment':doxyComment(first=True, text = cls, author = author, date = date, package = pkg)}))
+        if options.cpp==True and not options.type=='I':
+            yield (package+'/src/'+cls+'.cpp',render(options,cls,'cpp',{'date':date,'author':author}))
+        if options.bench==True and options.cpp==True:
+            yield (package+'/src/'+cls+'Bench.cpp',render(options,cls,'bench',{'date':date,'author':author}))
+    yield (package+'/CMakeLists.txt',cmakeLists(package,specs))
+    yield (package+'/options/%s.py'%pkg,optionsFile(package,specs))
+    #multithreaded options for the classes asking for them (--options), threads/slots of the first
+    hive = [(o,n) for o,n in specs if o.hiveOptions==True]
+    if len(hive)>0:
+        yield (package+'/options/%sHive.py'%pkg,hiveOptions([(os.path.basename(n),o) for o,n in hive],hive[0][0].threads,hive[0][0].slots))
+
+def writeDirectory(entries,root):
+    made = set()
+    count = 0
+    for path,text in entries:
+        path = os.path.join(root,path)
+        dirname = os.path.dirname(path)
+        if not dirname in made:
+            if not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            made.add(dirname)
+        f_out = open(path,'w',bufferSize)
+        f_out.write(text)
+        f_out.close()
+        count += 1
+    return count
+
+def writeTar(entries,out,compress=False):
+    #stream mode: nothing is seeked, out can be a pipe
+    archive = tarfile.open(fileobj=out,mode='w|gz' if compress else 'w|',bufsize=bufferSize)
+    now = time.time()
+    count = 0
+    for path,text in entries:
+        info = tarfile.TarInfo(path)
+        info.size = len(text)
+        info.mtime = now
+        info.mode = 0644
+        archive.addfile(info,StringIO(text))
+        count += 1
+    archive.close()
+    return count
+
+def writeZip(entries,out):
+    archive = zipfile.ZipFile(out,'w',zipfile.ZIP_DEFLATED)
+    count = 0
+    for path,text in entries:
+        info = zipfile.ZipInfo(path,time.localtime()[:6])
+        info.external_attr = 0644<<16
+        info.compress_type = zipfile.ZIP_DEFLATED
+        archive.writestr(info,text)
+        count += 1
+    archive.close()
+    return count
+
+if __name__ == "__main__":
+    parser = OptionParser( usage = "usage: %prog [options] package manifest" )
+    parser.add_option('-f','--format', action='store',default='dir',choices=['dir','tar','tgz','zip'],help='dir (default), tar, tgz or zip')
+    parser.add_option('-o','--output', action='store',help='Directory to write into (default .), or the archive file (default stdout for tar and tgz)')
+    (options, args) = parser.parse_args()
+    if not len(args)==2:
+        parser.print_usage()
+        sys.exit(1)
+    package,manifest = args
+
+    specs = read_manifest(manifest)
+    errors = validate(specs)
+    errors+= duplicates(specs)
+    if len(errors)>0:
+        for err in errors:
+            print >> sys.stderr, err
+        print >> sys.stderr, 'manifest %s is not valid, nothing generated'%manifest
+        sys.exit(1)
+    for spec,name in specs:
+        parse_type(spec)
+
+    entries = scaffold(package.rstrip('/'),specs)
+    if options.format=='dir':
+        count = writeDirectory(entries,options.output if not options.output==None else '.')
+    elif options.format=='zip':
+        if options.output==None:
+            parser.error('zip needs an output file (-o)')
+        count = writeZip(entries,options.output)
+    else:
+        out = sys.stdout if options.output in [None,'-'] else open(options.output,'wb')
+        count = writeTar(entries,out,options.format=='tgz')
+        out.flush()
+    print >> sys.stderr, '%d files generated for %s'%(count,package)
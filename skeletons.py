@@ -0,0 +1,134 @@
+#!/usr/bin/python
+# What:  registry of the raw_skeletons, read and compiled to string.Template once per process
+#
+# Skeletons are looked up by class type (as in MakeLHCbCppClass -t) and file extension, and
+# optionally a sub-type: raw_<Base>_<subtype>.<ext> is used when it exists, raw_<Base>.<ext>
+# otherwise. A skeleton is read the first time it is asked for, so a run only opens the files of
+# the requested type. Edited skeletons are picked up (mtime check, recompiled only if the content
+# changed). For slow network filesystems the whole directory can be packed into one file:
+#   skeletons.py --pack raw_skeletons.bundle
+# and used by pointing $LHCBSKELETON_BUNDLE at it (one read instead of one open per skeleton).
+
+import sys,os,thread
+from string import Template
+import profiling
+
+skeletonDir = os.path.dirname(os.path.abspath(__file__))+'/raw_skeletons'
+
+#class type -> base name of its skeleton files
+skeletonNames = {'A':'Algorithm','DVA':'DaVinciAlgorithm','GFA':'GaudiFunctional',
+                 'T':'Tool','I':'Interface','S':'class'}
+
+def skeletonFile(ctype,ext,subtype=None):
+    fname = 'raw_'+skeletonNames.get(ctype,'class')
+    if not subtype==None:
+        fname += '_'+subtype
+    return fname+'.'+ext
+
+class Skeleton:
+    def __init__(self,fname,text,mtime=None):
+        self.fname = fname
+        self.text = text
+        self.mtime = mtime
+        self.template = Template(text)
+
+class SkeletonRegistry:
+    def __init__(self,path=skeletonDir,bundle=None):
+        self.path = path
+        self.bundle = bundle
+        self.lock = thread.allocate_lock()
+        self.skeletons = {}
+        self.mtime = None
+        self.load()
+
+    def load(self):
+        if not self.bundle==None:
+            import json
+            profiling.count('stat')
+            profiling.count('open')
+            self.mtime = os.stat(self.bundle).st_mtime
+            f_in = open(self.bundle,'r')
+            packed = json.loads(f_in.read())
+            f_in.close()
+            self.skeletons = dict((str(fname),Skeleton(str(fname),str(text))) for fname,text in packed.items())
+            return
+        profiling.count('stat')
+        self.mtime = os.stat(self.path).st_mtime
+        #only listed here (None until read), see refresh()
+        self.skeletons = dict((fname,self.skeletons.get(fname)) for fname in os.listdir(self.path))
+
+    def read(self,fname,old=None):
+        path = self.path+'/'+fname
+        with profiling.stage('skeleton read',file=fname):
+            profiling.count('stat')
+            profiling.count('open')
+            mtime = os.stat(path).st_mtime
+            f_in = open(path,'r')
+            text = f_in.read()
+            f_in.close()
+        if not old==None and text==old.text:
+            old.mtime = mtime
+            return old
+        return Skeleton(fname,text,mtime)
+
+    def refresh(self,fname):
+        #reload the listing if files came or went, and the skeleton if it was edited or not yet read
+        if not self.bundle==None:
+            profiling.count('stat')
+            if not os.stat(self.bundle).st_mtime==self.mtime:
+                self.load()
+            return
+        profiling.count('stat')
+        if not os.stat(self.path).st_mtime==self.mtime:
+            self.load()
+        if not fname in self.skeletons:
+            return
+        old = self.skeletons[fname]
+        if old==None:
+            self.skeletons[fname] = self.read(fname)
+            return
+        profiling.count('stat')
+        if not os.stat(self.path+'/'+fname).st_mtime==old.mtime:
+            self.skeletons[fname] = self.read(fname,old)
+
+    def get(self,ctype,ext,subtype=None):
+        with self.lock:
+            fname = skeletonFile(ctype,ext,subtype)
+            self.refresh(fname)
+            if not fname in self.skeletons:
+                fname = skeletonFile(ctype,ext)
+                self.refresh(fname)
+            return self.skeletons[fname]
+
+    def template(self,ctype,ext,subtype=None):
+        return self.get(ctype,ext,subtype).template
+
+    def readAll(self):
+        with self.lock:
+            for fname in self.skeletons.keys():
+                self.refresh(fname)
+
+    def pack(self,out):
+        import json
+        self.readAll()
+        with self.lock:
+            f_out = open(out,'w')
+            f_out.write(json.dumps(dict((fname,skel.text) for fname,skel in self.skeletons.items()),sort_keys=True))
+            f_out.close()
+
+registry = None
+def getRegistry():
+    global registry
+    if registry==None:
+        registry = SkeletonRegistry(bundle=os.environ.get('LHCBSKELETON_BUNDLE'))
+    return registry
+
+def template(ctype,ext,subtype=None):
+    return getRegistry().template(ctype,ext,subtype)
+
+if __name__ == "__main__":
+    if len(sys.argv)==3 and sys.argv[1]=='--pack':
+        SkeletonRegistry().pack(sys.argv[2])
+    else:
+        print 'usage: skeletons.py --pack BUNDLE'
+        sys.exit(1)
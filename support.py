@@ -1,21 +1,86 @@
 #!/usr/bin/python
 #helpers
-import sys,os,pwd,time
-def doxyComment(text='',first = False):
+import os,time
+import profiling
+def doxyComment(text='',first = False, author = None, date = None, package = None):
+    #author, date and package default to the generation context of this process
     retstr = "/*"
+    if first==True and None in [author,date,package]:
+        generation = generationContext()
+        author = author if not author==None else generation.author
+        date = date if not date==None else generation.date
+        package = package if not package==None else generation.package
     if first==True:
-        cwd = os.getcwd().split('/')[-1]
-        retstr+='* @class %s %s.h %s.h\n'%(text, text, cwd+'/'+text)
+        retstr+='* @class %s %s.h %s.h\n'%(text, text, package+'/'+text)
     else: retstr+= "* %s\n"%text
     retstr+= "*\n"*2
     if first==True:
-        retstr+= "* @author %s\n"%((pwd.getpwuid(os.getuid())[4]).split(',')[0])
-        retstr+= "* @date   %s\n"%(time.strftime("%Y-%m-%d"))
+        retstr+= "* @author %s\n"%author
+        retstr+= "* @date   %s\n"%date
     retstr+="*/\n"
     return retstr
 def comment(text='',sep = '-',isFinal=False):
     com = "//"+sep*75
     return ("%s\n// %s\n%s\n"%(com,text,com) if isFinal==False else com)
 
+def toolTypes(tools):
+    #the -T list, as class names
+    if tools==None:
+        return []
+    return [tool.strip() for tool in tools.split(',') if not tool.strip()=='']
+
+def forwardDeclaration(cls):
+    #class A::B::C; as namespace A { namespace B { class C; } }
+    parts = cls.split('::')
+    ret = 'class %s;'%parts[-1]
+    for namespace in reversed(parts[:-1]):
+        ret = 'namespace %s { %s }'%(namespace,ret)
+    return ret
+
+def include(cls):
+    return '#include "%s.h"'%cls.split('::')[-1]
+
+def toolDeclarations(tools,lean=False):
+    #the -T interfaces in a header: forward declared when lean, included otherwise
+    tools = toolTypes(tools)
+    if len(tools)==0:
+        return ''
+    return '\n'.join(forwardDeclaration(tool) if lean==True else include(tool) for tool in tools)+'\n\n'
+
+def toolIncludes(tools,lean=False):
+    #what a lean header only declares is included by the .cpp
+    if not lean==True:
+        return ''
+    return ''.join('\n'+include(tool) for tool in toolTypes(tools))
+
+def pchInclude(pch):
+    return '#include "%s"\n'%pch if not pch==None else ''
+
 def exists(file):
     return os.path.isfile(file) 
+
+def authorName():
+    #full name of the current user from the passwd entry
+    import pwd
+    with profiling.stage('author lookup'):
+        profiling.count('getpwuid')
+        return (pwd.getpwuid(os.getuid())[4]).split(',')[0]
+
+class GenerationContext:
+    #what every file generated by this process shares
+    def __init__(self):
+        self.author = authorName()
+        self.date = time.strftime("%Y-%m-%d")
+        self.package = os.getcwd().split('/')[-1]
+
+generation = None
+def generationContext():
+    #resolved once per process; long running processes call resetContext() per request
+    global generation
+    if generation==None:
+        generation = GenerationContext()
+    return generation
+
+def resetContext():
+    global generation
+    generation = None
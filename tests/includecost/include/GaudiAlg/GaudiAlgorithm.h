@@ -0,0 +1,4 @@
+#pragma once
+#include "GaudiKernel/Algorithm.h"
+#include <string>
+class GaudiAlgorithm : public Algorithm {};
@@ -0,0 +1,3 @@
+#pragma once
+#include <vector>
+class Algorithm {};
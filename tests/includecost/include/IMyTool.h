@@ -0,0 +1,4 @@
+#pragma once
+#include "GaudiKernel/Algorithm.h"
+/* #include "NotFollowed.h" */
+class IMyTool {};
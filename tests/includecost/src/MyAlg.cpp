@@ -0,0 +1,2 @@
+#include "MyAlg.h"
+#include "GaudiKernel/Algorithm.h"
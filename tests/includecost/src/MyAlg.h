@@ -0,0 +1,3 @@
+#pragma once
+#include "GaudiAlg/GaudiAlgorithm.h"
+class MyAlg : public GaudiAlgorithm {};
@@ -0,0 +1,9 @@
+#include "Counter.h"
+
+DECLARE_COMPONENT( Counter )
+
+StatusCode Counter::execute() {
+  ++m_count;
+  setFilterPassed( true );
+  return StatusCode::SUCCESS;
+}
@@ -0,0 +1,13 @@
+#pragma once
+#include "GaudiAlg/GaudiAlgorithm.h"
+
+/** @class Counter Counter.h
+ *
+ *  @author A. Uthor
+ *  @date   2016-05-04
+ */
+class Counter : public GaudiAlgorithm {
+public:
+  Counter( const std::string& name, ISvcLocator* pSvcLocator );
+  StatusCode execute() override;
+};
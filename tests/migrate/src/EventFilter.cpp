@@ -0,0 +1,9 @@
+#include "EventFilter.h"
+
+DECLARE_COMPONENT( EventFilter )
+
+StatusCode EventFilter::execute() {
+  const LHCb::ODIN* odin = getIfExists<LHCb::ODIN>( LHCb::ODINLocation::Default );
+  setFilterPassed( odin != nullptr );
+  return StatusCode::SUCCESS;
+}
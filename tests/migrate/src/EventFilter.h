@@ -0,0 +1,13 @@
+#pragma once
+#include "GaudiAlg/GaudiAlgorithm.h"
+
+/** @class EventFilter EventFilter.h
+ *
+ *  @author A. Uthor
+ *  @date   2016-05-04
+ */
+class EventFilter : public GaudiAlgorithm {
+public:
+  EventFilter( const std::string& name, ISvcLocator* pSvcLocator );
+  StatusCode execute() override;
+};
@@ -0,0 +1,3 @@
+#include "Helper.h"
+
+int Helper::value() const { return 42; }
@@ -0,0 +1,6 @@
+#pragma once
+
+class Helper {
+public:
+  int value() const;
+};
@@ -0,0 +1,9 @@
+#include "HitMaker.h"
+
+DECLARE_COMPONENT( HitMaker )
+
+StatusCode HitMaker::execute() {
+  LHCb::Hits* hits = new LHCb::Hits();
+  put( hits, "Raw/Hits" );
+  return StatusCode::SUCCESS;
+}
@@ -0,0 +1,13 @@
+#pragma once
+#include "GaudiAlg/GaudiHistoAlg.h"
+
+/** @class HitMaker HitMaker.h
+ *
+ *  @author A. Uthor
+ *  @date   2016-05-04
+ */
+class HitMaker : public GaudiHistoAlg {
+public:
+  HitMaker( const std::string& name, ISvcLocator* pSvcLocator );
+  StatusCode execute() override;
+};
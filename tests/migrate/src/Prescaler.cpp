@@ -0,0 +1,10 @@
+#include "Prescaler.h"
+
+DECLARE_COMPONENT( Prescaler )
+
+StatusCode Prescaler::execute() {
+  LHCb::Particles* out = new LHCb::Particles();
+  put( out, "/Event/Phys/Prescaled/Particles" );
+  setFilterPassed( m_accept() );
+  return StatusCode::SUCCESS;
+}
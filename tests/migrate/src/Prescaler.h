@@ -0,0 +1,13 @@
+#pragma once
+#include "GaudiAlg/GaudiAlgorithm.h"
+
+/** @class Prescaler Prescaler.h
+ *
+ *  @author A. Uthor
+ *  @date   2016-05-04
+ */
+class Prescaler : public GaudiAlgorithm {
+public:
+  Prescaler( const std::string& name, ISvcLocator* pSvcLocator );
+  StatusCode execute() override;
+};
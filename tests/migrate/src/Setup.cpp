@@ -0,0 +1,7 @@
+#include "Setup.h"
+
+DECLARE_COMPONENT( Setup )
+
+StatusCode Setup::initialize() {
+  return GaudiAlgorithm::initialize();
+}
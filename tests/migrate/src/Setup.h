@@ -0,0 +1,13 @@
+#pragma once
+#include "GaudiAlg/GaudiAlgorithm.h"
+
+/** @class Setup Setup.h
+ *
+ *  @author A. Uthor
+ *  @date   2016-05-04
+ */
+class Setup : public GaudiAlgorithm {
+public:
+  Setup( const std::string& name, ISvcLocator* pSvcLocator );
+  StatusCode initialize() override;
+};
@@ -0,0 +1,10 @@
+#include "TrackMonitor.h"
+
+DECLARE_COMPONENT( TrackMonitor )
+
+StatusCode TrackMonitor::execute() {
+  // get<LHCb::MCParticles>( "/Event/MC/Particles" ) is not read any more
+  const LHCb::Tracks* tracks = get<LHCb::Tracks>( m_prefix + "/Tracks" );
+  counter( "tracks" ) += tracks->size();
+  return StatusCode::SUCCESS;
+}
@@ -0,0 +1,15 @@
+#pragma once
+#include "GaudiAlg/GaudiAlgorithm.h"
+
+/** @class TrackMonitor TrackMonitor.h
+ *
+ *  @author A. Uthor
+ *  @date   2016-05-04
+ */
+class TrackMonitor : public GaudiAlgorithm {
+public:
+  TrackMonitor( const std::string& name, ISvcLocator* pSvcLocator );
+  StatusCode execute() override;
+private:
+  std::string m_prefix;
+};
@@ -0,0 +1,16 @@
+#include "TrackSelector.h"
+
+DECLARE_COMPONENT( TrackSelector )
+
+TrackSelector::TrackSelector( const std::string& name, ISvcLocator* pSvcLocator )
+  : GaudiAlgorithm( name, pSvcLocator ) {
+  declareProperty("Input", m_in = LHCb::TrackLocation::Default);
+}
+
+StatusCode TrackSelector::execute() {
+  const LHCb::Tracks* tracks = get<LHCb::Tracks>( m_in );
+  const LHCb::RecVertices* pvs = get<LHCb::RecVertices>( "/Event/Rec/Vertex/Primary" );
+  LHCb::Particles* out = new LHCb::Particles();
+  put( out, "/Event/Phys/Selected/Particles" );
+  return StatusCode::SUCCESS;
+}
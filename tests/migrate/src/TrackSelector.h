@@ -0,0 +1,15 @@
+#pragma once
+#include "GaudiAlg/GaudiAlgorithm.h"
+
+/** @class TrackSelector TrackSelector.h
+ *
+ *  @author A. Uthor
+ *  @date   2016-05-04
+ */
+class TrackSelector : public GaudiAlgorithm {
+public:
+  TrackSelector( const std::string& name, ISvcLocator* pSvcLocator );
+  StatusCode execute() override;
+private:
+  std::string m_in;
+};
@@ -0,0 +1,12 @@
+#include "TrackSplitter.h"
+
+DECLARE_COMPONENT( TrackSplitter )
+
+StatusCode TrackSplitter::execute() {
+  auto tracks = get<LHCb::Tracks>( LHCb::TrackLocation::Default );
+  LHCb::Tracks* longTracks = new LHCb::Tracks();
+  LHCb::Tracks* downTracks = new LHCb::Tracks();
+  put( longTracks, "/Event/Rec/Track/Long" );
+  put( downTracks, "/Event/Rec/Track/Downstream" );
+  return StatusCode::SUCCESS;
+}
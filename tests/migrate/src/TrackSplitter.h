@@ -0,0 +1,13 @@
+#pragma once
+#include "GaudiAlg/GaudiAlgorithm.h"
+
+/** @class TrackSplitter TrackSplitter.h
+ *
+ *  @author A. Uthor
+ *  @date   2016-05-04
+ */
+class TrackSplitter : public GaudiAlgorithm {
+public:
+  TrackSplitter( const std::string& name, ISvcLocator* pSvcLocator );
+  StatusCode execute() override;
+};
@@ -0,0 +1,57 @@
+#!/usr/bin/python
+# What:  validation of .json manifests, before anything is written
+#   python -m unittest discover tests
+
+import sys,os,json,shutil,tempfile,unittest
+from StringIO import StringIO
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from batch import run_manifest
+
+class ManifestTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmpdir = tempfile.mkdtemp()
+        os.chdir(self.tmpdir)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmpdir)
+
+    def run_entries(self,entries):
+        #returns (exit code, output, files written)
+        f_out = open('manifest.json','w')
+        f_out.write(json.dumps(entries))
+        f_out.close()
+        stdout = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            code = run_manifest('manifest.json',1)
+            out = sys.stdout.getvalue()
+        finally:
+            sys.stdout = stdout
+        return code,out,sorted(fname for fname in os.listdir('.') if not fname=='manifest.json')
+
+    def test_converted(self):
+        #numbers given as strings, as on the command line
+        code,out,files = self.run_entries([{'name':'MyAlg','type':'GFA','threads':'8','slots':9,'hiveOptions':True,'reentrant':False}])
+        self.assertEqual(code,0,out)
+        self.assertEqual(files,['MyAlg.cpp','MyAlg.h','MyAlgOptions.py'])
+        self.assertTrue('THREADS=8 SLOTS=9' in open('MyAlgOptions.py').read())
+
+    def test_invalid(self):
+        #every problem reported, and nothing written for the valid entries either
+        code,out,files = self.run_entries([{'name':'MyAlg','type':'A'},
+                                           ['MyOther'],
+                                           {'name':'MyBad','type':'A','threads':'x','reentrant':'false','Interface':5},
+                                           {'name':'MyUnknown','colour':'red'}])
+        self.assertEqual(code,1)
+        self.assertEqual(files,[])
+        self.assertEqual(out.splitlines(),['entry 2: not an object: ["MyOther"]',
+                                           'entry 3 (MyBad): Interface has to be a string, not 5',
+                                           'entry 3 (MyBad): reentrant has to be true or false, not "false"',
+                                           "entry 3 (MyBad): option threads: invalid integer value: 'x'",
+                                           'entry 4 (MyUnknown): unknown manifest key colour',
+                                           'manifest manifest.json is not valid, nothing generated'])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+#!/usr/bin/python
+# What:  MakeLHCbCppClass.py run as the editors run it (no tty)
+#   python -m unittest discover tests
+
+import sys,os,subprocess,unittest
+top = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def run(argv):
+    #returns (exit code, output)
+    devnull = open(os.devnull,'r')
+    proc = subprocess.Popen([sys.executable,os.path.join(top,'MakeLHCbCppClass.py')]+argv,
+                            stdin=devnull,stdout=subprocess.PIPE,stderr=subprocess.STDOUT)
+    out = proc.communicate()[0]
+    devnull.close()
+    return proc.returncode,out
+
+class CommandLineTest(unittest.TestCase):
+    def test_functional_default(self):
+        #no -f: a Transformer, header and source
+        code,out = run(['-t','GFA','MyAlg'])
+        self.assertEqual(code,0,out)
+        self.assertTrue('Gaudi::Functional::Transformer<OUTPUT (const INPUT& )>' in out)
+        self.assertTrue('OUTPUT MyAlg::operator()(const INPUT&) const {' in out)
+
+    def test_functional_types(self):
+        #-i/-o are kept, with the full type name as the vim plugin passes it and with the short code
+        for gtype in ['Transformer','T']:
+            code,out = run(['-t','GFA','-f',gtype,'-i','const LHCb::Tracks','-o','LHCb::Particles','--bench','MyAlg'])
+            self.assertEqual(code,0,out)
+            self.assertTrue('Gaudi::Functional::Transformer<LHCb::Particles (const LHCb::Tracks& )>' in out)
+            self.assertTrue('LHCb::Particles MyAlg::operator()(const LHCb::Tracks&) const {' in out)
+            self.assertTrue('synthetic<LHCb::Tracks>( size )' in out)
+
+    def test_functional_unknown(self):
+        code,out = run(['-t','GFA','-f','Q','MyAlg'])
+        self.assertEqual(code,1)
+        self.assertTrue(out.startswith('unknown GaudiFunctional Q'),out)
+
+if __name__ == "__main__":
+    unittest.main()
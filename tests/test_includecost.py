@@ -0,0 +1,44 @@
+#!/usr/bin/python
+# What:  includecost.py against the stub include tree in tests/includecost
+#   python -m unittest discover tests
+
+import sys,os,shutil,tempfile,unittest
+top = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,top)
+from includecost import IncludeGraph
+from api import ClassSpec, render
+
+stubs = os.path.join(top,'tests','includecost')
+
+class IncludeCostTest(unittest.TestCase):
+    def setUp(self):
+        self.graph = IncludeGraph([os.path.join(stubs,'include')])
+
+    def test_source(self):
+        #MyAlg.cpp (2 lines) + MyAlg.h (3) + GaudiAlgorithm.h (4) + Algorithm.h (3), Algorithm.h counted once
+        cost = self.graph.cost(os.path.join(stubs,'src','MyAlg.cpp'))
+        self.assertEqual(cost,{'headers':3,'lines':12,'unresolved':['string','vector']})
+
+    def test_commented_include(self):
+        cost = self.graph.cost(os.path.join(stubs,'include','IMyTool.h'))
+        self.assertEqual(cost,{'headers':1,'lines':7,'unresolved':['vector']})
+
+    def test_lean_header(self):
+        #a lean header only forward declares the tool, so IMyTool.h is not read
+        tmpdir = tempfile.mkdtemp()
+        try:
+            costs = {}
+            for lean in [False,True]:
+                path = os.path.join(tmpdir,'MyAlg%s.h'%('Lean' if lean else ''))
+                f_out = open(path,'w')
+                f_out.write(render(ClassSpec('MyAlg',type='A',Tool='IMyTool',lean=lean or None),'h'))
+                f_out.close()
+                costs[lean] = self.graph.cost(path)
+            self.assertEqual(costs[False]['headers'],3)
+            self.assertEqual(costs[True]['headers'],2)
+            self.assertTrue(costs[True]['lines']<costs[False]['lines'])
+        finally:
+            shutil.rmtree(tmpdir)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/python
+# What:  -U/--refresh only write files whose content changes, and never edited or foreign files
+#   python -m unittest discover tests
+
+import sys,os,json,shutil,tempfile,subprocess,unittest
+top = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class IncrementalTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def run_class(self,argv):
+        #returns the summary line of the report, and the lines before it
+        devnull = open(os.devnull,'r')
+        proc = subprocess.Popen([sys.executable,os.path.join(top,'MakeLHCbCppClass.py')]+argv,cwd=self.tmpdir,
+                                stdin=devnull,stdout=subprocess.PIPE,stderr=subprocess.STDOUT)
+        out = proc.communicate()[0]
+        devnull.close()
+        self.assertEqual(proc.returncode,0,out)
+        lines = out.splitlines()
+        return lines[-1],lines[:-1]
+
+    def path(self,fname):
+        return os.path.join(self.tmpdir,fname)
+
+    def read(self,fname):
+        f_in = open(self.path(fname),'r')
+        text = f_in.read()
+        f_in.close()
+        return text
+
+    def write(self,fname,text):
+        f_out = open(self.path(fname),'w')
+        f_out.write(text)
+        f_out.close()
+
+    def age(self,fnames):
+        #pretend the files were written an hour ago, returns their (inode, mtime)
+        for fname in fnames:
+            mtime = os.stat(self.path(fname)).st_mtime-3600
+            os.utime(self.path(fname),(mtime,mtime))
+        return self.stats(fnames)
+
+    def stats(self,fnames):
+        return dict((fname,(os.stat(self.path(fname)).st_ino,os.stat(self.path(fname)).st_mtime)) for fname in fnames)
+
+    def test_unchanged(self):
+        summary,lines = self.run_class(['-U','-t','A','MyAlg'])
+        self.assertEqual(summary,'2 written, 0 unchanged, 0 modified, 0 unmanaged, 0 missing')
+        before = self.age(['MyAlg.h','MyAlg.cpp'])
+        summary,lines = self.run_class(['-U','-t','A','MyAlg'])
+        self.assertEqual(summary,'0 written, 2 unchanged, 0 modified, 0 unmanaged, 0 missing')
+        self.assertEqual(self.stats(['MyAlg.h','MyAlg.cpp']),before)
+
+    def test_changed_spec(self):
+        #rewritten by renaming a new file over it, nothing left behind
+        self.run_class(['-U','-t','A','MyAlg'])
+        before = self.age(['MyAlg.h','MyAlg.cpp'])
+        summary,lines = self.run_class(['-U','-t','A','-a','Histo','MyAlg'])
+        self.assertEqual(summary,'2 written, 0 unchanged, 0 modified, 0 unmanaged, 0 missing')
+        after = self.stats(['MyAlg.h','MyAlg.cpp'])
+        for fname in before:
+            self.assertNotEqual(after[fname][0],before[fname][0])
+            self.assertNotEqual(after[fname][1],before[fname][1])
+        self.assertTrue('GaudiHistoAlg' in self.read('MyAlg.h'))
+        self.assertEqual(sorted(os.listdir(self.tmpdir)),['.lhcbskeleton.json','MyAlg.cpp','MyAlg.h'])
+
+    def test_modified(self):
+        self.run_class(['-U','-t','A','MyAlg'])
+        self.write('MyAlg.cpp',self.read('MyAlg.cpp')+'// edited\n')
+        summary,lines = self.run_class(['-U','-t','A','-a','Histo','MyAlg'])
+        self.assertEqual(summary,'1 written, 0 unchanged, 1 modified, 0 unmanaged, 0 missing')
+        self.assertEqual(lines,['MyAlg.cpp: modified, not updated'])
+        self.assertTrue(self.read('MyAlg.cpp').endswith('// edited\n'))
+
+    def test_unmanaged(self):
+        self.write('MyAlg.h','// not generated\n')
+        summary,lines = self.run_class(['-U','-t','A','MyAlg'])
+        self.assertEqual(summary,'1 written, 0 unchanged, 0 modified, 1 unmanaged, 0 missing')
+        self.assertEqual(lines,['MyAlg.h: unmanaged, not updated'])
+        self.assertEqual(self.read('MyAlg.h'),'// not generated\n')
+
+    def test_refresh(self):
+        #re-rendered with what the manifest recorded (here as if the skeleton had changed)
+        self.run_class(['-U','-t','A','MyAlg'])
+        self.run_class(['-U','-t','T','MyTool'])
+        os.unlink(self.path('MyTool.cpp'))
+        manifest = json.loads(self.read('.lhcbskeleton.json'))
+        for fname in ['MyAlg.h','MyAlg.cpp']:
+            manifest[fname]['spec']['AlgorithmType'] = 'Histo'
+        self.write('.lhcbskeleton.json',json.dumps(manifest))
+        before = self.age(['MyTool.h'])
+        summary,lines = self.run_class(['--refresh','.'])
+        self.assertEqual(summary,'2 written, 1 unchanged, 0 modified, 0 unmanaged, 1 missing')
+        self.assertEqual(lines,['./MyTool.cpp: missing, not updated'])
+        self.assertTrue('GaudiHistoAlg' in self.read('MyAlg.h'))
+        self.assertEqual(self.stats(['MyTool.h']),before)
+        self.assertFalse(os.path.exists(self.path('MyTool.cpp')))
+
+if __name__ == "__main__":
+    unittest.main()
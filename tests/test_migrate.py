@@ -0,0 +1,62 @@
+#!/usr/bin/python
+# What:  migrate.py against the stub legacy algorithms in tests/migrate
+#   python -m unittest discover tests
+
+import sys,os,unittest
+top = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,top)
+from migrate import findPairs, analyse, migrateOne
+
+stubs = os.path.join(top,'tests','migrate')
+
+def pair(name):
+    return os.path.join(stubs,'src',name+'.h'),os.path.join(stubs,'src',name+'.cpp')
+
+class MigrateTest(unittest.TestCase):
+    def test_pairs(self):
+        self.assertEqual([os.path.basename(header) for root,header,source in findPairs([stubs])],
+                         ['Counter.h','EventFilter.h','Helper.h','HitMaker.h','Prescaler.h','Setup.h',
+                          'TrackMonitor.h','TrackSelector.h','TrackSplitter.h'])
+
+    def test_shapes(self):
+        #get<>/getIfExists<> are inputs, put outputs, a computed setFilterPassed a filter
+        for name,shape in [('TrackSelector','Transformer'),('TrackSplitter','MultiTransformer'),
+                           ('HitMaker','Producer'),('TrackMonitor','Consumer'),('EventFilter','FilterPredicate')]:
+            info = analyse(*pair(name))
+            self.assertEqual((info['name'],info['shape']),(name,shape))
+
+    def test_not_convertible(self):
+        for name,reason in [('Counter','no event data access (get<>/put) found'),
+                            ('Prescaler','no inputs but a filter decision'),
+                            ('Setup','no execute() to convert')]:
+            info = analyse(*pair(name))
+            self.assertEqual((info['shape'],info['reason']),(None,reason),name)
+        #not an algorithm at all
+        self.assertFalse('name' in analyse(*pair('Helper')))
+
+    def test_locations(self):
+        #literals and constants as they are, members through their property default, the rest noted
+        info = analyse(*pair('TrackSelector'))
+        self.assertEqual(info['inputs'],[('LHCb::Tracks','m_in','LHCb::TrackLocation::Default'),
+                                         ('LHCb::RecVertices','"/Event/Rec/Vertex/Primary"','"/Event/Rec/Vertex/Primary"')])
+        self.assertEqual(info['outputs'],[('LHCb::Particles','"/Event/Phys/Selected/Particles"','"/Event/Phys/Selected/Particles"')])
+        info = analyse(*pair('TrackMonitor'))
+        self.assertEqual(info['inputs'],[('LHCb::Tracks','m_prefix + "/Tracks"',None)])
+        self.assertEqual(info['notes'],['input location m_prefix + "/Tracks" is computed, set it by hand'])
+
+    def test_rendered(self):
+        header,source = pair('TrackSelector')
+        info,files = migrateOne((stubs,header,source,'functional'))
+        self.assertEqual([path for path,text in files],['functional/src/TrackSelector.h','functional/src/TrackSelector.cpp'])
+        text = files[0][1]
+        self.assertTrue('Transformer<LHCb::Particles (const LHCb::Tracks&, const LHCb::RecVertices& )>' in text)
+        self.assertTrue('KeyValue("Input1",{LHCb::TrackLocation::Default})' in text)
+        self.assertTrue('KeyValue("Input2",{"/Event/Rec/Vertex/Primary"})' in text)
+        self.assertTrue('KeyValue("OutputLocation",{"/Event/Phys/Selected/Particles"})' in text)
+        self.assertTrue('@author A. Uthor' in text and '@date   2016-05-04' in text)
+        #a histogramming base is kept
+        info,files = migrateOne((stubs,)+pair('HitMaker')+('functional',))
+        self.assertTrue('Producer<LHCb::Hits ( ), Gaudi::Functional::Traits::BaseClass_t<GaudiHistoAlg>>' in files[0][1])
+
+if __name__ == "__main__":
+    unittest.main()
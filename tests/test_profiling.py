@@ -0,0 +1,49 @@
+#!/usr/bin/python
+# What:  --profile of requests run one after the other in one process, as MakeLHCbCppServer.py does
+#   python -m unittest discover tests
+
+import sys,os,json,shutil,tempfile,unittest
+from StringIO import StringIO
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from MakeLHCbCppClass import main
+from support import resetContext
+import profiling
+
+def classes(path):
+    f_in = open(path,'r')
+    events = json.loads(f_in.read())['traceEvents']
+    f_in.close()
+    return [event['args']['cls'] for event in events if event['name']=='class']
+
+class ProfilingTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmpdir = tempfile.mkdtemp()
+        os.chdir(self.tmpdir)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmpdir)
+
+    def request(self,argv):
+        stdout = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            resetContext()
+            return main(argv)
+        finally:
+            sys.stdout = stdout
+
+    def test_session_per_request(self):
+        #each request writes its own trace when main() returns, with only its own events
+        self.request(['-t','A','--profile','first.json','FirstAlg'])
+        self.assertEqual(classes('first.json'),['FirstAlg'])
+        self.request(['-t','A','SecondAlg'])
+        self.request(['-t','A','--profile','third.json','ThirdAlg'])
+        self.assertEqual(classes('third.json'),['ThirdAlg'])
+        self.assertEqual(classes('first.json'),['FirstAlg'])
+        #nothing is recorded in between
+        self.assertEqual((profiling.enabled,profiling.session,profiling.events),(False,None,[]))
+
+if __name__ == "__main__":
+    unittest.main()
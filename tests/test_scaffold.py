@@ -0,0 +1,44 @@
+#!/usr/bin/python
+# What:  scaffold.py writing a package from a manifest
+#   python -m unittest discover tests
+
+import sys,os,shutil,tarfile,tempfile,subprocess,unittest
+top = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class ScaffoldTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def scaffold(self,argv,lines):
+        #returns (exit code, stderr)
+        f_out = open(os.path.join(self.tmpdir,'classes.txt'),'w')
+        f_out.write('\n'.join(lines)+'\n')
+        f_out.close()
+        proc = subprocess.Popen([sys.executable,os.path.join(top,'scaffold.py')]+argv+['Phys/MyPackage','classes.txt'],
+                                cwd=self.tmpdir,stdout=subprocess.PIPE,stderr=subprocess.PIPE)
+        err = proc.communicate()[1]
+        return proc.returncode,err
+
+    def test_package(self):
+        code,err = self.scaffold(['-f','tar','-o','pkg.tar'],['-t A MyAlg','-t GFA -f T tools/MyTransformer','-t I IMyTool'])
+        self.assertEqual(code,0,err)
+        tar = tarfile.open(os.path.join(self.tmpdir,'pkg.tar'))
+        self.assertEqual(sorted(tar.getnames()),['Phys/MyPackage/CMakeLists.txt','Phys/MyPackage/options/MyPackage.py',
+                                                 'Phys/MyPackage/src/IMyTool.h','Phys/MyPackage/src/MyAlg.cpp',
+                                                 'Phys/MyPackage/src/MyAlg.h','Phys/MyPackage/src/MyTransformer.cpp',
+                                                 'Phys/MyPackage/src/MyTransformer.h'])
+        tar.close()
+
+    def test_same_class_name(self):
+        #a/MyAlg and b/MyAlg would both be src/MyAlg
+        code,err = self.scaffold(['-o','out'],['-t A a/MyAlg','-t T b/MyAlg.h'])
+        self.assertEqual(code,1)
+        self.assertEqual(err.splitlines(),['entry 2 (b/MyAlg): src/MyAlg also generated by entry 1 (a/MyAlg)',
+                                           'manifest classes.txt is not valid, nothing generated'])
+        self.assertFalse(os.path.exists(os.path.join(self.tmpdir,'out')))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# What:  MakeLHCbCppServer.py answering MakeLHCbCppClient.py, as the editors call it (no tty)
+#   python -m unittest discover tests
+
+import sys,os,socket,shutil,tempfile,threading,subprocess,unittest
+top = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,top)
+from MakeLHCbCppServer import GeneratorServer, GeneratorHandler
+from MakeLHCbCppClient import request
+
+class ServerTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir,'server.sock')
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmpdir)
+
+    def serve(self,requests):
+        server = GeneratorServer(self.path,GeneratorHandler)
+        server.timeout = 5
+        def loop():
+            for num in range(requests):
+                server.handle_request()
+            server.server_close()
+        thread = threading.Thread(target=loop)
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def test_non_ascii(self):
+        #utf-8 arguments in, utf-8 text out, also when the client writes into a pipe
+        thread = self.serve(2)
+        status,text = request(['-t','T','-I','IFooé','MyTool.h'],self.path)
+        self.assertEqual(status,0,text)
+        self.assertTrue(u'IFooé' in text)
+        devnull = open(os.devnull,'r')
+        proc = subprocess.Popen([sys.executable,os.path.join(top,'MakeLHCbCppClient.py'),'-t','T','-I','IFooé','MyTool.h'],
+                                stdin=devnull,stdout=subprocess.PIPE,stderr=subprocess.STDOUT,
+                                env=dict(os.environ,LHCBSKELETON_SOCKET=self.path))
+        out = proc.communicate()[0]
+        devnull.close()
+        thread.join()
+        self.assertEqual(proc.returncode,0,out)
+        self.assertTrue('IFooé' in out)
+
+    def test_index_per_request(self):
+        #a class added to the project after the first request is found by the next one
+        project = os.path.join(self.tmpdir,'project')
+        os.mkdir(project)
+        thread = self.serve(2)
+        status,text = request(['-t','A','--index',project,'MyFirstAlg.h'],self.path)
+        self.assertEqual(status,0,text)
+        f_out = open(os.path.join(project,'MyAlg.h'),'w')
+        f_out.write('class MyAlg : public GaudiAlgorithm {\n};\n')
+        f_out.close()
+        status,text = request(['-t','A','--index',project,'MyAlg.h'],self.path)
+        thread.join()
+        self.assertEqual(status,1,text)
+        self.assertTrue(text.startswith('MyAlg already declared (class) in %s:1'%os.path.join(project,'MyAlg.h')),text)
+
+    def test_stuck_server(self):
+        #a server that accepts but never answers counts as no server
+        sock = socket.socket(socket.AF_UNIX,socket.SOCK_STREAM)
+        sock.bind(self.path)
+        sock.listen(1)
+        try:
+            self.assertEqual(request(['-t','A','MyAlg'],self.path,0.2),None)
+        finally:
+            sock.close()
+
+if __name__ == "__main__":
+    unittest.main()
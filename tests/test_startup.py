@@ -0,0 +1,26 @@
+#!/usr/bin/python
+# What:  start-up of the command line: within a fixed budget, without the lazily imported modules
+#   python -m unittest discover tests
+
+import sys,os,subprocess,unittest
+top = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,top)
+from benchmark import startupTime
+
+#ms from process start until make_files is entered (median), see benchmark.py --startup-budget
+budget = 40
+#only imported when needed, never by a plain command line run
+lazy = ['json','pwd','atexit','hashlib','multiprocessing','subprocess','socket','tempfile']
+
+class StartupTest(unittest.TestCase):
+    def test_budget(self):
+        startup = startupTime(['-t','A'],5)*1e3
+        self.assertTrue(startup<budget,'start-up %.1f ms, budget %d ms'%(startup,budget))
+
+    def test_lazy_imports(self):
+        code = 'import sys; import MakeLHCbCppClass; print(" ".join(sorted(sys.modules)))'
+        loaded = subprocess.check_output([sys.executable,'-c',code],cwd=top).split()
+        self.assertEqual([name for name in lazy if name in loaded],[])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+#!/usr/bin/python
+# What:  the pre-rendered variants give the same text as LHCbHeader/LHCbCpp
+#   python -m unittest discover tests
+
+import sys,os,unittest
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import variants
+from LHCbHeader import LHCbHeader
+from LHCbCpp import LHCbCpp
+from MakeLHCbCppClass import make_parser, parse_type
+from support import doxyComment
+
+ctx = {'comment':doxyComment(first=True, text = 'MyClass', author = 'A. Uthor', date = '2017-03-29', package = 'Pkg'),
+       'date':'2017-03-29','author':'A. Uthor'}
+
+def parsed(argv):
+    (options, args) = make_parser().parse_args(argv)
+    options.isTTY = False
+    parse_type(options)
+    return options
+
+class VariantsTest(unittest.TestCase):
+    def test_check(self):
+        #every variant of variantArgs(), and the reentrancy of the reentrant ones
+        self.assertEqual(variants.check(),0)
+
+    def test_classes_in_one_process(self):
+        #classes of the same variant rendered one after the other keep their own per class values
+        for argv in [['-t','GFA','-f','T','--inputLocations','/Event/A','--outputLocations','/Event/B'],
+                     ['-t','GFA','-f','T','--inputLocations','/Event/C','--outputLocations','/Event/D'],
+                     ['-t','GFA','-f','T','-i','const LHCb::Tracks','-o','LHCb::Particles'],
+                     ['-t','GFA','-f','T','-i','const LHCb::MCParticles','-o','LHCb::Tracks'],
+                     ['-t','A','-T','IMyTool','--pch','one.h'],
+                     ['-t','A','-T','IOtherTool','--pch','other.h']]:
+            for ext,cls in [('h',LHCbHeader),('cpp',LHCbCpp)]:
+                fast = variants.render(parsed(argv),'MyClass',ext,ctx)
+                self.assertEqual(fast,cls('MyClass',parsed(argv),context=ctx).genText,'%s (%s)'%(' '.join(argv),ext))
+
+    def test_index_size(self):
+        #one entry per variant, however many classes with their own types and locations
+        from api import ClassSpec
+        variants.index.clear()
+        for num in range(200):
+            spec = ClassSpec('MyAlg%d'%num,type='GFA',GaudiFunctionalInput='const Input%d'%num,
+                             GaudiFunctionalInputLocations='/Event/In%d'%num)
+            text = variants.render(spec,spec.name,'h',ctx)
+            self.assertTrue('(const Input%d& )'%num in text and '"/Event/In%d"'%num in text)
+        self.assertEqual(len(variants.index),1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+#!/usr/bin/python
+# What:  pre-rendered skeletons, one per variant of the class type/sub-type matrix
+#
+# Everything LHCbHeader and LHCbCpp derive from the type, sub-type and interface (present or not)
+# is substituted once per variant; what is left are the per class holes below, among them the
+# types and locations of a GaudiFunctional. Rendering a class is then a single fill of those
+# holes. The index is rebuilt for a variant whenever its skeleton is reloaded with a different
+# content (see skeletons.py).
+#   variants.py --check  renders every variant both ways and fails unless they are identical
+
+import sys,os,thread
+from string import Template
+from optparse import Values
+from LHCbHeader import LHCbHeader,functionalFields
+from LHCbCpp import LHCbCpp,functionalBody
+from LHCbBench import LHCbBench,benchFields
+from skeletons import getRegistry
+from support import doxyComment,generationContext,toolDeclarations,toolIncludes,pchInclude
+import profiling
+
+#per class fields, left as holes in the pre-rendered variants
+holes = {'comment':'${comment}','date':'${date}','author':'${author}',
+         'forwardDecls':'${forwardDecls}','toolIncludes':'${toolIncludes}','pchInclude':'${pchInclude}'}
+#and of a GaudiFunctional: what its types and locations give, computed per file by
+functionalHoles = {'h':functionalFields,'cpp':functionalBody,'bench':benchFields}
+holes.update((field,'${%s}'%field) for field in ['GaudiFunctionalInput','GaudiFunctionalOutput','GaudiFunctionalReturn',
+                                                 'funcIO','soaStructs','operatorParenText','benchInputs','benchCall'])
+#the (parsed) options LHCbHeader and LHCbCpp render from
+specFields = ['type','AlgorithmType','DaVinciAlgorithmType','GaudiFunctional',
+              'GaudiFunctionalInput','GaudiFunctionalOutput','Interface','GFInheritance','reentrant','soa',
+              'Tool','lean','pch','GaudiFunctionalInputLocations','GaudiFunctionalOutputLocations','timing','bench',
+              'hiveOptions','threads','slots']
+
+index = {}
+indexLock = thread.allocate_lock()
+
+def variantKey(options,ext):
+    ctype = options.type if options.type in ['A','DVA','GFA','T','I'] else 'S'
+    subtype = {'A':options.AlgorithmType,'DVA':options.DaVinciAlgorithmType,
+               'GFA':options.GaudiFunctional}.get(ctype)
+    if ctype=='GFA':
+        #types and locations are holes, so one variant per shape
+        subtype = (subtype,options.soa)
+    elif ctype in ['A','DVA'] and options.reentrant==True:
+        subtype = 'reentrant'
+    elif ctype=='I' and options.lean==True:
+        subtype = 'lean'
+    return (ctype,subtype,ctype=='T' and not options.Interface==None,ext,options.lean,options.timing)
+
+def variantSkeleton(key):
+    ctype,subtype,ext = key[0],key[1],key[3]
+    if isinstance(subtype,tuple):
+        subtype = subtype[0]
+    if ext=='bench':
+        return getRegistry().get(ctype,'cpp','bench')
+    return getRegistry().get(ctype,ext,subtype)
+
+def precompile(options,key):
+    #render through LHCbHeader/LHCbCpp with holes for every per class field, on a private copy
+    proto = Values(dict((field,getattr(options,field,None)) for field in specFields))
+    if key[2]:
+        proto.Interface = '${Interface}'
+    proto.GFInheritance = '${GFInheritance}'
+    if key[3]=='h':
+        text = LHCbHeader('${name}',proto,context=holes).genText
+    elif key[3]=='bench':
+        text = LHCbBench('${name}',proto,context=holes).genText
+    else:
+        text = LHCbCpp('${name}',proto,context=holes).genText
+    return Template(text)
+
+def lookup(options,ext):
+    key = variantKey(options,ext)
+    skeleton = variantSkeleton(key)
+    entry = index.get(key)
+    if entry==None or not entry[0] is skeleton:
+        with indexLock, profiling.stage('pre-render',variant=repr(key)):
+            entry = (skeleton,precompile(options,key))
+            index[key] = entry
+    return entry[1]
+
+def context(name,ext):
+    if ext=='h':
+        return {'comment':doxyComment(first=True, text = name)}
+    generation = generationContext()
+    return {'date':generation.date,'author':generation.author}
+
+def render(options,name,ext,ctx=None):
+    #same text as LHCbHeader(name,options) (ext h), LHCbCpp(name,options) (ext cpp) or
+    #LHCbBench(name,options) (ext bench, the benchmark driver of a GFA)
+    #options is only read: any object with the specFields attributes, e.g. an api.ClassSpec
+    fill = dict(ctx if not ctx==None else context(name,ext))
+    fill['name'] = name
+    fill['Interface'] = options.Interface
+    fill['GFInheritance'] = options.GFInheritance if not options.GFInheritance==None else ''
+    fill['forwardDecls'] = toolDeclarations(options.Tool,options.lean)
+    fill['toolIncludes'] = toolIncludes(options.Tool,options.lean)
+    fill['pchInclude'] = pchInclude(options.pch)
+    if options.type=='GFA':
+        fill.update(functionalHoles[ext](options))
+    temp = lookup(options,ext)
+    with profiling.stage('substitute',file=name+'.'+ext):
+        return temp.safe_substitute(fill)
+
+def variantArgs():
+    #command line arguments for every variant in headerConfigs
+    from MakeLHCbCppClass import headerConfigs, GFCodes
+    args = [['-t','A','-a',sub] for sub in headerConfigs['NAtype']]
+    args+= [['-t','DVA','-d',sub] for sub in headerConfigs['DVtype']]
+    args+= [['-t','A','-r'],['-t','DVA','-r']]
+    for gtype in headerConfigs['GFtype']:
+        args+= [['-t','GFA','-f',GFCodes[gtype]],['-t','GFA','-f',GFCodes[gtype],'-n','NonStandardBase']]
+        if not gtype in ['Consumer','FilterPredicate']:
+            args+= [['-t','GFA','-f',GFCodes[gtype],'--soa']]
+    args+= [['-t','T'],['-t','T','-I','IMyInterface'],['-t','I'],['-t','S']]
+    args+= [['-t','A','-T','IMyTool,LHCb::IOtherTool'],['-t','A','-T','IMyTool,LHCb::IOtherTool','--lean','--pch','pch.h'],
+            ['-t','GFA','-f','T','-T','IOtherTool','--pch','other.h'],['-t','T','-I','IMyInterface','--lean'],['-t','I','--lean'],['-t','GFA','-f','T','--lean','-T','IMyTool']]
+    args+= [['-t','A','-a','Histo','--timing'],['-t','A','-r','--timing'],['-t','DVA','-d','Tuple','--timing'],
+            ['-t','DVA','-r','--timing'],['-t','GFA','-f','P','--timing'],['-t','GFA','-f','MF','--soa','--timing']]
+    args+= [['-t','GFA','-f',GFCodes[gtype],'--bench'] for gtype in headerConfigs['GFtype']]
+    #same variant, other locations or types: rendered one after the other, each has to keep its own
+    args+= [['-t','GFA','-f','T','--inputLocations','/Event/A','--outputLocations','/Event/B'],
+            ['-t','GFA','-f','T','--inputLocations','/Event/C','--outputLocations','/Event/D'],
+            ['-t','GFA','-f','M','--inputLocations','LHCb::TrackLocation::Default,/Event/A'],
+            ['-t','GFA','-f','T','-i','const LHCb::Tracks','-o','LHCb::Particles','--bench'],
+            ['-t','GFA','-f','MF','-i','const LHCb::Tracks','-o','std::tuple<LHCb::Particles,LHCb::Vertices>','--soa']]
+    return args
+
+def check():
+    #the pre-rendered path has to be byte identical to LHCbHeader/LHCbCpp for every variant,
+    #and reentrant variants have to pass their own check
+    from MakeLHCbCppClass import make_parser, parse_type
+    from reentrancy import findings
+    parser = make_parser()
+    ctx = {'comment':doxyComment(first=True, text = 'MyClass'),'date':'2017-03-29','author':'A. Uthor'}
+    failed = 0
+    for argv in variantArgs():
+        (options, args) = parser.parse_args(argv)
+        options.isTTY = False
+        parse_type(options)
+        exts = ['h'] if options.type=='I' else ['h','cpp']
+        if options.bench==True:
+            exts.append('bench')
+        fast = [render(options,'MyClass',ext,ctx) for ext in exts]
+        slow = [{'h':LHCbHeader,'cpp':LHCbCpp,'bench':LHCbBench}[ext]('MyClass',options,context=ctx).genText for ext in exts]
+        for ext,f,s in zip(exts,fast,slow):
+            if not f==s:
+                print 'MISMATCH %s (%s)'%(' '.join(argv),ext)
+                failed += 1
+        if options.reentrant==True:
+            for line,message in findings(fast[0]):
+                print 'NOT REENTRANT %s: %d: %s'%(' '.join(argv),line,message)
+                failed += 1
+    print '%d variants checked, %d mismatches'%(len(variantArgs()),failed)
+    return failed
+
+if __name__ == "__main__":
+    if len(sys.argv)==2 and sys.argv[1]=='--check':
+        sys.exit(1 if check() else 0)
+    print 'usage: variants.py --check'
+    sys.exit(1)